@@ -0,0 +1,160 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+USER_RECIPE_RELATIONS = ('favorites', 'shopping_cart')
+USER_RECIPE_IDS_KEY = 'users:{user_id}:{relation}:recipe_ids'
+USER_RECIPE_IDS_TIMEOUT = 60 * 60 * 24
+RECIPE_REPRESENTATION_KEY = 'recipes:{recipe_id}:representation'
+RECIPE_REPRESENTATION_TIMEOUT = 60 * 60 * 24
+VERSION_KEY = 'versions:{name}'
+
+
+def _delete_now_and_on_commit(keys) -> None:
+    """
+    Delete the given cache keys right away and once again after
+    the current transaction commits, so that a concurrent request
+    cannot put the uncommitted state back into the cache.
+
+    """
+    keys = list(keys)
+    if not keys:
+        return
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def _version_key(name: str) -> str:
+    return VERSION_KEY.format(name=name)
+
+
+def user_version_name(user_id: int) -> str:
+    return f'users:{user_id}'
+
+
+def get_versions(*names: str) -> dict[str, int]:
+    """
+    Return a dict with the current version stamps of the given data.
+
+    A version stamp is the time of the last change in nanoseconds.
+    Versions missing from the cache start at the current time,
+    so that a lost version never matches an earlier one.
+
+    """
+    keys = {_version_key(name): name for name in names}
+    versions = cache.get_many(keys)
+    for key in set(keys).difference(versions):
+        cache.add(key, time.time_ns(), timeout=None)
+        versions[key] = cache.get(key)
+    return {keys[key]: version for key, version in versions.items()}
+
+
+def bump_versions(*names: str) -> None:
+    """
+    Set the versions of the given data to the current time, right away
+    and once again after the current transaction commits.
+
+    """
+    if not names:
+        return
+
+    def bump():
+        cache.set_many(
+            {_version_key(name): time.time_ns() for name in names},
+            timeout=None,
+        )
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def _user_recipe_ids_key(user_id: int, relation: str) -> str:
+    return USER_RECIPE_IDS_KEY.format(user_id=user_id, relation=relation)
+
+
+def get_user_recipe_ids(user) -> dict[str, frozenset[int]]:
+    """
+    Return a dict with the ids of the recipes in the user's
+    favorites and shopping cart.
+
+    The id sets are read from db only on a cache miss and are kept
+    in the cache until the user's favorites or shopping cart change.
+
+    """
+    if user.is_anonymous:
+        return {relation: frozenset() for relation in USER_RECIPE_RELATIONS}
+
+    keys = {
+        relation: _user_recipe_ids_key(user.pk, relation)
+        for relation in USER_RECIPE_RELATIONS
+    }
+    cached_ids = cache.get_many(keys.values())
+
+    user_recipe_ids = {}
+    missing_ids = {}
+    for relation, key in keys.items():
+        if key not in cached_ids:
+            cached_ids[key] = missing_ids[key] = frozenset(
+                getattr(user, relation).values_list('id', flat=True)
+            )
+        user_recipe_ids[relation] = cached_ids[key]
+
+    if missing_ids:
+        cache.set_many(missing_ids, timeout=USER_RECIPE_IDS_TIMEOUT)
+    return user_recipe_ids
+
+
+def invalidate_user_recipe_ids(user_ids, relation: str) -> None:
+    """
+    Drop the cached recipe id sets of the given users
+    and bump their versions.
+
+    """
+    user_ids = list(user_ids)
+    _delete_now_and_on_commit(
+        _user_recipe_ids_key(user_id, relation) for user_id in user_ids
+    )
+    bump_versions(*map(user_version_name, user_ids))
+
+
+def _recipe_representation_key(recipe_id: int) -> str:
+    return RECIPE_REPRESENTATION_KEY.format(recipe_id=recipe_id)
+
+
+def get_recipe_representations(recipe_ids) -> dict[int, dict]:
+    """
+    Return a dict with the cached user-independent representations
+    of the given recipes by recipe id. Missing recipes are omitted.
+
+    """
+    keys = {
+        _recipe_representation_key(recipe_id): recipe_id
+        for recipe_id in recipe_ids
+    }
+    return {
+        keys[key]: representation
+        for key, representation in cache.get_many(keys).items()
+    }
+
+
+def set_recipe_representations(representations: dict[int, dict]) -> None:
+    cache.set_many(
+        {
+            _recipe_representation_key(recipe_id): representation
+            for recipe_id, representation in representations.items()
+        },
+        timeout=RECIPE_REPRESENTATION_TIMEOUT,
+    )
+
+
+def invalidate_recipe_representations(recipe_ids) -> None:
+    """
+    Drop the cached representations of the given recipes
+    and bump the version of the recipes.
+
+    """
+    keys = [_recipe_representation_key(recipe_id) for recipe_id in recipe_ids]
+    if keys:
+        _delete_now_and_on_commit(keys)
+        bump_versions('recipes')
@@ -0,0 +1,52 @@
+import django
+from django.db import IntegrityError, router, transaction
+from django.db.models.constants import OnConflict
+
+# Manager._insert() is internal API; its on_conflict and returning_fields
+# arguments are known to behave as used here in these Django versions.
+SINGLE_QUERY_INSERT = (4, 1) <= django.VERSION[:2] <= (5, 2)
+
+
+def insert_ignoring_conflicts(model, objs, returning: str) -> set:
+    """
+    Insert the model instances skipping the ones conflicting with
+    existing rows and return the values of the returning field
+    of the rows actually inserted.
+
+    Unlike bulk_create(ignore_conflicts=True), this tells apart
+    the rows inserted by a concurrent transaction in the meantime.
+    The rows are inserted with a single query (ON CONFLICT DO NOTHING
+    RETURNING) in the supported Django versions, and one by one
+    in savepoints with the public bulk_create() otherwise.
+    No signals are sent either way.
+
+    """
+    objs = list(objs)
+    if not objs:
+        return set()
+    if not SINGLE_QUERY_INSERT:
+        return _insert_one_by_one(model, objs, returning)
+    opts = model._meta
+    fields = [field for field in opts.concrete_fields if not field.primary_key]
+    rows = model._base_manager._insert(
+        objs,
+        fields=fields,
+        returning_fields=[opts.get_field(returning)],
+        using=router.db_for_write(model),
+        on_conflict=OnConflict.IGNORE,
+    )
+    return {row[0] for row in rows if row is not None}
+
+
+def _insert_one_by_one(model, objs, returning: str) -> set:
+    attname = model._meta.get_field(returning).attname
+    using = router.db_for_write(model)
+    inserted = set()
+    for obj in objs:
+        try:
+            with transaction.atomic(using=using):
+                model._base_manager.using(using).bulk_create([obj])
+        except IntegrityError:
+            continue
+        inserted.add(getattr(obj, attname))
+    return inserted
@@ -0,0 +1,108 @@
+import csv
+import json
+from typing import Iterable, Iterator
+
+ShoppingCartRow = tuple[str, str, int]
+
+SHOPPING_CART_EXPORTERS = {}
+
+
+def register_exporter(cls):
+    """Register the shopping cart exporter class by its format."""
+    SHOPPING_CART_EXPORTERS[cls.format] = cls
+    return cls
+
+
+def get_exporter(format):
+    """Return an exporter for the given format or None if unknown."""
+    exporter_class = SHOPPING_CART_EXPORTERS.get(format)
+    return exporter_class() if exporter_class else None
+
+
+class ShoppingCartExporter:
+    """
+    Base class for shopping cart exporters.
+
+    Exporters convert (ingredient name, measurement unit, amount) rows
+    into chunks of text one row at a time, so that the file can be
+    streamed without being built in memory.
+
+    """
+    format = None
+    extension = None
+    content_type = None
+
+    def export(self, rows: Iterable[ShoppingCartRow]) -> Iterator[str]:
+        raise NotImplementedError(
+            'ShoppingCartExporter subclasses must define export().'
+        )
+
+
+@register_exporter
+class TextExporter(ShoppingCartExporter):
+    format = 'txt'
+    extension = 'txt'
+    content_type = 'text/plain; charset=utf-8'
+
+    def export(self, rows):
+        for ingredient_name, unit, amount in rows:
+            yield f'{ingredient_name}({unit}): {amount}\n'
+
+
+class _Echo:
+    """File-like object returning the written value to csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+@register_exporter
+class CSVExporter(ShoppingCartExporter):
+    format = 'csv'
+    extension = 'csv'
+    content_type = 'text/csv; charset=utf-8'
+    header = ('Ингредиент', 'Единица измерения', 'Количество')
+
+    def export(self, rows):
+        writer = csv.writer(_Echo())
+        yield writer.writerow(self.header)
+        for row in rows:
+            yield writer.writerow(row)
+
+
+@register_exporter
+class JSONExporter(ShoppingCartExporter):
+    format = 'json'
+    extension = 'json'
+    content_type = 'application/json'
+
+    def export(self, rows):
+        separator = '['
+        for ingredient_name, unit, amount in rows:
+            yield separator + json.dumps(
+                {
+                    'name': ingredient_name,
+                    'measurement_unit': unit,
+                    'amount': amount,
+                },
+                ensure_ascii=False,
+            )
+            separator = ','
+        yield ']' if separator == ',' else '[]'
+
+
+@register_exporter
+class MarkdownExporter(ShoppingCartExporter):
+    format = 'md'
+    extension = 'md'
+    content_type = 'text/markdown; charset=utf-8'
+
+    @staticmethod
+    def escape(value):
+        return str(value).replace('|', r'\|')
+
+    def export(self, rows):
+        yield '| Ингредиент | Единица измерения | Количество |\n'
+        yield '| --- | --- | ---: |\n'
+        for row in rows:
+            yield '| {} | {} | {} |\n'.format(*map(self.escape, row))
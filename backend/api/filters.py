@@ -1,50 +1,141 @@
-from django.db.models import Q
-from django_filters.rest_framework import BooleanFilter, CharFilter, FilterSet
+from django.db.models import Case, Exists, OuterRef, Q, Value, When
+from django_filters.rest_framework import (
+    BooleanFilter,
+    CharFilter,
+    ChoiceFilter,
+    FilterSet,
+    NumberFilter,
+)
 
-from recipes.models import Recipe
+from api.cache import get_user_recipe_ids
+from api.pagination import IngredientPagination
+from recipes.models import Recipe, normalize_search_name
 
 
 class IngredientFilter(FilterSet):
     """
     Filter IngredientUnit queryset by ingredient name
-    (case-insensitive starts-with or case-insensitive containment test).
+    (containment test of the normalized search value and name,
+    backed by a trigram index).
+
+    Ingredients whose names start with the searched value go first,
+    followed by the ones only containing it, both ordered by name.
+    The number of listed results can be capped with the 'limit'
+    parameter, which sets the page size instead when the results
+    are paginated.
 
     """
     name = CharFilter(
-        field_name="ingredient__name",
+        field_name="ingredient__search_name",
         method='filter_ingredient_name',
     )
+    limit = NumberFilter(
+        method='limit_results',
+        min_value=1,
+    )
 
     def filter_ingredient_name(self, queryset, field_name, value):
-        primary_lookup = '__'.join([field_name, 'istartswith'])
-        secondary_lookup = '__'.join([field_name, 'icontains'])
-        return (queryset.filter(Q(**{primary_lookup: value})
-                                | Q(**{secondary_lookup: value})))
+        value = normalize_search_name(value)
+        prefix_lookup = '__'.join([field_name, 'startswith'])
+        containment_lookup = '__'.join([field_name, 'contains'])
+        return queryset.filter(
+            **{containment_lookup: value},
+        ).annotate(
+            name_match_rank=Case(
+                When(Q(**{prefix_lookup: value}), then=Value(0)),
+                default=Value(1),
+            )
+        ).order_by(
+            'name_match_rank', 'ingredient__name', 'measurement_unit__name',
+        )
+
+    def limit_results(self, queryset, field_name, value):
+        view = getattr(self.request, 'parser_context', {}).get('view')
+        if (getattr(view, 'action', 'list') != 'list'
+                or IngredientPagination.cursor_query_param in self.data):
+            return queryset
+        return queryset[:int(value)]
 
 
 class RecipeFilter(FilterSet):
     """
-    Filter Recipe queryset by author id, tag slug,
+    Filter Recipe queryset by author id, tag slug, name
+    (containment test of the normalized search value and name),
     is_favorited and is_in_shopping_cart fields.
 
+    Recipes with any of the 'tags' are returned by default,
+    recipes with all of them - if tags_match=all.
+
     """
-    is_favorited = BooleanFilter(field_name='is_favorited')
-    is_in_shopping_cart = BooleanFilter(field_name='is_in_shopping_cart')
+    TAGS_MATCH_ANY = 'any'
+    TAGS_MATCH_ALL = 'all'
+
+    is_favorited = BooleanFilter(
+        field_name='favorites',
+        method='filter_by_user_recipes',
+    )
+    is_in_shopping_cart = BooleanFilter(
+        field_name='shopping_cart',
+        method='filter_by_user_recipes',
+    )
+    name = CharFilter(
+        field_name='search_name',
+        method='filter_by_search_name',
+    )
     tags = CharFilter(
         field_name='tags__slug',
         method='filter_by_tag_slug',
     )
+    tags_match = ChoiceFilter(
+        choices=(
+            (TAGS_MATCH_ANY, 'Любой из тегов'),
+            (TAGS_MATCH_ALL, 'Все теги'),
+        ),
+        method='filter_tags_match',
+    )
 
     class Meta:
         model = Recipe
         fields = ('author',)
 
+    def filter_by_user_recipes(self, queryset, field_name, value):
+        """Filter the queryset by the cached ids of the recipes
+        in the request user's favorites or shopping cart.
+
+        """
+        recipe_ids = get_user_recipe_ids(self.request.user)[field_name]
+        if value:
+            return queryset.filter(id__in=recipe_ids)
+        return queryset.exclude(id__in=recipe_ids)
+
+    def filter_by_search_name(self, queryset, field_name, value):
+        lookup = '__'.join([field_name, 'contains'])
+        return queryset.filter(**{lookup: normalize_search_name(value)})
+
     def filter_by_tag_slug(self, queryset, field_name, value):
         """Filter and return a queryset of all Recipe instances
-        that contain at least one tag from the 'tags' query params.
+        that contain at least one (or each) tag from the 'tags'
+        query params.
+
+        The tags are checked with EXISTS subqueries on the recipe-tag
+        table instead of a join, so recipes are not multiplied by
+        their tags and no DISTINCT is needed.
 
         """
-        tags = self.request.GET.getlist('tags', None)
-        lookup = '__'.join([field_name, 'in'])
-        queryset = queryset.filter(**{lookup: tags}).distinct()
+        tags = set(self.request.GET.getlist('tags'))
+        tagged_recipes = Recipe.tags.through.objects.filter(
+            recipe=OuterRef('pk'),
+        )
+        if self.form.cleaned_data.get('tags_match') == self.TAGS_MATCH_ALL:
+            for tag in tags:
+                queryset = queryset.filter(
+                    Exists(tagged_recipes.filter(tag__slug=tag))
+                )
+            return queryset
+        return queryset.filter(
+            Exists(tagged_recipes.filter(tag__slug__in=tags))
+        )
+
+    def filter_tags_match(self, queryset, field_name, value):
+        """The tags matching mode is applied by filter_by_tag_slug."""
         return queryset
@@ -0,0 +1,66 @@
+from users.models import Subscription
+
+
+def get_loader(context: dict, loader_class):
+    """
+    Return the loader of the given class shared by all the serializers
+    using the serializer context, creating it on first use.
+
+    """
+    loaders = context.setdefault('loaders', {})
+    if loader_class not in loaders:
+        loaders[loader_class] = loader_class(context.get('request'))
+    return loaders[loader_class]
+
+
+class BatchLoader:
+    """
+    Base class for per-request loaders batching per-object lookups.
+
+    Serializers register the keys they are going to look up with prime(),
+    usually for all the objects of a list at once, and get the values
+    with load(). The first load() resolves all the registered keys
+    with a single batch_load() call; the values are kept for the rest
+    of the serialization, keys missing from the result get the default.
+
+    """
+    default = None
+
+    def __init__(self, request=None):
+        self.request = request
+        self.values = {}
+        self.pending = set()
+
+    def prime(self, keys) -> None:
+        self.pending.update(key for key in keys if key not in self.values)
+
+    def load(self, key):
+        if key not in self.values:
+            self.pending.add(key)
+            keys, self.pending = self.pending, set()
+            values = self.batch_load(keys)
+            for loaded_key in keys:
+                self.values[loaded_key] = values.get(loaded_key, self.default)
+        return self.values[key]
+
+    def batch_load(self, keys: set) -> dict:
+        raise NotImplementedError(
+            'BatchLoader subclasses must define batch_load().'
+        )
+
+
+class SubscriptionLoader(BatchLoader):
+    """Load whether the request user is subscribed to the authors."""
+    default = False
+
+    def batch_load(self, author_ids):
+        user = getattr(self.request, 'user', None)
+        if user is None or user.is_anonymous:
+            return {}
+        return dict.fromkeys(
+            Subscription.objects.filter(
+                user=user,
+                author__in=author_ids,
+            ).values_list('author', flat=True),
+            True,
+        )
@@ -0,0 +1,77 @@
+import csv
+import os
+import timeit
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from api.serializers import IngredientUnitSerializer, ValuesSerializer
+from recipes.models import Ingredient, IngredientUnit, MeasurementUnit
+
+CATALOG_FILES = (
+    (MeasurementUnit, 'measurement_units.csv'),
+    (Ingredient, 'ingredients.csv'),
+    (IngredientUnit, 'ingredient_unit.csv'),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares the model serializer and the values() serialization '
+        'of the full ingredient catalog.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def _load_catalog(self):
+        """Load the ingredient catalog from the csv files."""
+        for model, csv_file in CATALOG_FILES:
+            file_path = os.path.join(settings.CSV_DATA_PATH, csv_file)
+            with open(file_path, 'r', encoding='utf-8') as file:
+                objs = [model(**row) for row in csv.DictReader(file)]
+            for obj in objs:
+                if hasattr(obj, 'set_search_name'):
+                    obj.set_search_name()
+            model.objects.bulk_create(objs)
+
+    def _benchmark(self, name, serialize, repeat):
+        seconds = min(timeit.repeat(serialize, number=1, repeat=repeat))
+        self.stdout.write(f'{name}: {seconds * 1000:.1f} ms')
+        return seconds
+
+    def handle(self, *args, **options):
+        renderer = JSONRenderer()
+        queryset = IngredientUnit.objects.select_related(
+            'ingredient', 'measurement_unit',
+        )
+        values_serializer = ValuesSerializer(IngredientUnitSerializer)
+
+        def serialize_models():
+            return renderer.render(
+                IngredientUnitSerializer(queryset.all(), many=True).data
+            )
+
+        def serialize_values():
+            return renderer.render(values_serializer.to_representation(
+                values_serializer.get_queryset(queryset.all())
+            ))
+
+        with transaction.atomic():
+            if not IngredientUnit.objects.exists():
+                self._load_catalog()
+            self.stdout.write(
+                f'Catalog size: {IngredientUnit.objects.count()} rows'
+            )
+            if serialize_models() != serialize_values():
+                self.stderr.write('The serialized catalogs differ.')
+            models_time = self._benchmark(
+                'Model serializer', serialize_models, options['repeat'],
+            )
+            values_time = self._benchmark(
+                'values() serializer', serialize_values, options['repeat'],
+            )
+            self.stdout.write(f'Speedup: {models_time / values_time:.1f}x')
+            transaction.set_rollback(True)
@@ -0,0 +1,126 @@
+import hashlib
+
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+from api.serializers import ValuesSerializer
+from recipes.ingredient_index import get_ingredient_index
+
+NANOSECONDS = 10 ** 9
+
+
+class ConditionalGetMixin:
+    """
+    Add ETag and Last-Modified validators to list and retrieve responses.
+
+    Conditional requests (If-None-Match / If-Modified-Since) for
+    an unchanged resource are answered with 304 Not Modified
+    before the queryset is evaluated and serialized.
+
+    Views define get_versions() returning a dict with the version
+    stamps (nanosecond timestamps) of all the data the response
+    depends on, or None if the response cannot be validated.
+
+    """
+
+    def get_versions(self, request, *args, **kwargs):
+        raise NotImplementedError(
+            'ConditionalGetMixin requires get_versions() to be defined.'
+        )
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def get_conditional_response(self, handler, request, *args, **kwargs):
+        versions = self.get_versions(request, *args, **kwargs)
+        if not versions:
+            return handler(request, *args, **kwargs)
+
+        etag = self.get_etag(request, versions)
+        last_modified = max(versions.values()) // NANOSECONDS
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified,
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+
+        if response.status_code in (200, 304):
+            response.headers['ETag'] = etag
+            response.headers['Last-Modified'] = http_date(last_modified)
+            patch_cache_control(response, no_cache=True)
+            patch_vary_headers(response, ('Authorization',))
+        return response
+
+    @staticmethod
+    def get_etag(request, versions):
+        renderer = getattr(request, 'accepted_renderer', None)
+        data = repr((
+            getattr(renderer, 'format', None),
+            sorted(versions.items()),
+        ))
+        return quote_etag(hashlib.md5(
+            data.encode(), usedforsecurity=False,
+        ).hexdigest())
+
+
+class IngredientIndexSearchMixin:
+    """
+    Serve ingredient name searches of the list action from
+    the memory-mapped ingredient index without querying the db.
+
+    Requests that are not valid searches, paginated requests and
+    requests made while the index file is unavailable are handled
+    by the filterset as usual.
+
+    """
+
+    def list(self, request, *args, **kwargs):
+        filterset = self.filterset_class(
+            request.query_params, queryset=self.queryset, request=request,
+        )
+        paginated = (
+            self.paginator is not None
+            and self.paginator.cursor_query_param in request.query_params
+        )
+        if (not paginated and filterset.is_valid()
+                and filterset.form.cleaned_data['name']):
+            limit = filterset.form.cleaned_data['limit']
+            results = get_ingredient_index().search(
+                filterset.form.cleaned_data['name'],
+                limit=int(limit) if limit else None,
+            )
+            if results is not None:
+                return Response(results)
+        return super().list(request, *args, **kwargs)
+
+
+class ValuesListMixin:
+    """
+    List a read-only catalog with values() in one query, bypassing
+    model instances and the model serializer of the view.
+
+    """
+
+    def list(self, request, *args, **kwargs):
+        serializer = ValuesSerializer(self.get_serializer_class())
+        queryset = serializer.get_queryset(
+            self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(
+                serializer.to_representation(page)
+            )
+        return Response(serializer.to_representation(queryset))
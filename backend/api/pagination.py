@@ -0,0 +1,201 @@
+import base64
+import binascii
+import json
+from collections import OrderedDict
+from datetime import date, datetime
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Forward-only keyset (seek) pagination.
+
+    The next page is selected with a WHERE condition on the ordering
+    field values of the last returned row instead of an OFFSET, and
+    no COUNT query is made, so every page costs the same regardless
+    of its depth. The last ordering field must be unique.
+
+    """
+    ordering = ('-pk',)
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'limit'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Неверный курсор.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request)
+        if position is not None:
+            try:
+                queryset = queryset.filter(
+                    self.get_position_filter(position)
+                )
+            except (ValidationError, TypeError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        self.has_next = len(results) > self.page_size
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size < 1:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last_item = self.page[-1]
+        position = [
+            self.get_field_value(last_item, field_name)
+            for field_name in self.get_field_names()
+        ]
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_cursor(position),
+        )
+
+    def get_field_names(self):
+        return [field.lstrip('-') for field in self.ordering]
+
+    @staticmethod
+    def get_field_value(obj, field_name):
+        if isinstance(obj, dict):
+            return obj[field_name]
+        value = obj
+        for attr in field_name.split('__'):
+            value = getattr(value, attr)
+        return value
+
+    def get_position_filter(self, position):
+        """
+        Return a Q object selecting the rows that follow the given
+        position in the pagination ordering:
+        (a > x) OR (a = x AND b > y) OR (a = x AND b = y AND c > z).
+
+        """
+        position_filter = Q()
+        equal_fields = {}
+        for ordering_field, value in zip(self.ordering, position):
+            field_name = ordering_field.lstrip('-')
+            lookup = 'lt' if ordering_field.startswith('-') else 'gt'
+            position_filter |= Q(
+                **equal_fields, **{f'{field_name}__{lookup}': value}
+            )
+            equal_fields[field_name] = value
+        return position_filter
+
+    @staticmethod
+    def encode_cursor(position):
+        position = [
+            value.isoformat() if isinstance(value, (date, datetime))
+            else value
+            for value in position
+        ]
+        data = json.dumps(position, ensure_ascii=False).encode('utf-8')
+        return base64.urlsafe_b64encode(data).decode('ascii')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded))
+        except (binascii.Error, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if (not isinstance(position, list)
+                or len(position) != len(self.ordering)):
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+
+class RecipeKeysetPagination(KeysetPagination):
+    ordering = ('-pub_date', 'name', 'id')
+
+
+class FeedPagination(KeysetPagination):
+    ordering = ('-created_at', '-id')
+
+
+class FavoritesPagination(KeysetPagination):
+    ordering = ('-created_at', '-id')
+
+
+class IngredientPagination(KeysetPagination):
+    """
+    Opt-in keyset pagination of ingredients by name and measurement unit.
+
+    Only requests with the cursor query parameter (empty for the first
+    page) are paginated, the rest get the full unpaginated list.
+    Searches by name are paginated by the name match rank of
+    IngredientFilter first, keeping the prefix matches first.
+
+    """
+    ordering = ('ingredient__name', 'measurement_unit__name', 'id')
+    rank_field = 'name_match_rank'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param not in request.query_params:
+            return None
+        if self.rank_field in queryset.query.annotations:
+            self.ordering = (self.rank_field, *self.ordering)
+        return super().paginate_queryset(queryset, request, view)
+
+
+class RecipePagination(PageNumberPagination):
+    """
+    Page number pagination of recipes.
+
+    Sending the cursor query parameter (empty for the first page)
+    switches to keyset pagination by (pub_date, name, id), which keeps
+    the cost of deep pages of the infinite-scroll feed constant.
+
+    """
+    keyset_pagination_class = RecipeKeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset_paginator = None
+        cursor_query_param = self.keyset_pagination_class.cursor_query_param
+        if cursor_query_param in request.query_params:
+            self.keyset_paginator = self.keyset_pagination_class()
+            return self.keyset_paginator.paginate_queryset(
+                queryset, request, view,
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset_paginator is not None:
+            return self.keyset_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -1,18 +1,43 @@
 import base64
-from collections import Counter
-from typing import OrderedDict
+import binascii
+import math
+import re
+from collections import Counter, OrderedDict
+from io import BytesIO
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.core.files.base import ContentFile
+from django.contrib.auth.models import AnonymousUser
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import (
+    InMemoryUploadedFile,
+    TemporaryUploadedFile,
+    UploadedFile,
+)
 from django.db import DatabaseError, transaction
+from django.db.models import Manager, Prefetch, prefetch_related_objects
 from djoser.serializers import (
     SetPasswordSerializer,
     UserCreateSerializer,
     UserSerializer,
 )
+from PIL import Image
 from rest_framework import serializers
 
-from recipes.models import IngredientUnit, Recipe, RecipeIngredientAmount, Tag
+from api.cache import (
+    get_recipe_representations,
+    get_user_recipe_ids,
+    set_recipe_representations,
+)
+from api.loaders import SubscriptionLoader, get_loader
+from recipes.models import (
+    FeedEntry,
+    IngredientUnit,
+    Recipe,
+    RecipeIngredientAmount,
+    ShoppingCartIngredient,
+    Tag,
+)
 from users.models import Subscription
 
 User = get_user_model()
@@ -64,6 +89,19 @@ class UserRegistrationSerializer(UserCreateSerializer):
         return user
 
 
+class BatchLoadingListSerializer(serializers.ListSerializer):
+    """
+    Let the child serializer prime its batch loaders with all
+    the list objects before they are serialized one by one.
+
+    """
+
+    def to_representation(self, data):
+        instances = list(data.all() if isinstance(data, Manager) else data)
+        self.child.prime_loaders(instances)
+        return super().to_representation(instances)
+
+
 class CustomUserSerializer(UserSerializer):
     """
     Serialiser for registered users' profiles.
@@ -80,19 +118,19 @@ class CustomUserSerializer(UserSerializer):
             'email',
             'username',
             'is_subscribed',
+            'recipes_count',
+            'followers_count',
+            'following_count',
         ]
+        list_serializer_class = BatchLoadingListSerializer
+
+    def prime_loaders(self, users):
+        get_loader(self.context, SubscriptionLoader).prime(
+            user.id for user in users
+        )
 
     def get_is_subscribed(self, obj):
-        request = self.context.get('request')
-        if request:
-            request_user = request.user
-            other_user = obj.id
-            return (request_user.is_authenticated
-                    and Subscription.objects.filter(
-                        user=request_user,
-                        author=other_user
-                    ).exists())
-        return False
+        return get_loader(self.context, SubscriptionLoader).load(obj.id)
 
 
 class CurrentUserSerializer(CustomUserSerializer):
@@ -110,6 +148,58 @@ class CurrentUserSerializer(CustomUserSerializer):
         return False
 
 
+class AuthorSerializer(CustomUserSerializer):
+    """
+    Serializer for recipe authors nested in the cached recipe
+    representations, so it leaves out the frequently changing counters.
+
+    """
+
+    class Meta(CustomUserSerializer.Meta):
+        fields = [
+            'id',
+            'first_name',
+            'last_name',
+            'email',
+            'username',
+            'is_subscribed',
+        ]
+
+
+class ValuesSerializer:
+    """
+    Read-only serializer of querysets fetched with values().
+
+    Produces the same data as the given model serializer without
+    instantiating models and serializer fields. The fields are
+    fetched with the lookups set in the model serializer
+    Meta.value_lookups or, if not set there, by the field names,
+    along with the annotations of the queryset (such as ranks
+    the rows are ordered and paginated by).
+
+    """
+
+    def __init__(self, serializer_class):
+        meta = serializer_class.Meta
+        value_lookups = getattr(meta, 'value_lookups', {})
+        self.fields = [
+            (field_name, value_lookups.get(field_name, field_name))
+            for field_name in meta.fields
+        ]
+
+    def get_queryset(self, queryset):
+        return queryset.values(
+            *(lookup for _, lookup in self.fields),
+            *queryset.query.annotations,
+        )
+
+    def to_representation(self, rows):
+        return [
+            {field_name: row[lookup] for field_name, lookup in self.fields}
+            for row in rows
+        ]
+
+
 class IngredientUnitSerializer(serializers.ModelSerializer):
     """Ingredient model serializer."""
     measurement_unit = serializers.StringRelatedField(read_only=True)
@@ -118,6 +208,10 @@ class IngredientUnitSerializer(serializers.ModelSerializer):
     class Meta:
         model = IngredientUnit
         fields = ('id', 'name', 'measurement_unit')
+        value_lookups = {
+            'name': 'ingredient__name',
+            'measurement_unit': 'measurement_unit__name',
+        }
 
 
 class TagSerializer(serializers.ModelSerializer):
@@ -129,14 +223,147 @@ class TagSerializer(serializers.ModelSerializer):
 
 
 class Base64ImageField(serializers.ImageField):
+    """
+    Image field accepting images as base64 data URIs.
+
+    The data is decoded chunk by chunk into an uploaded file kept
+    in memory or, if larger than FILE_UPLOAD_MAX_MEMORY_SIZE,
+    in a temporary file, as Django does with multipart uploads.
+    The decoded size is checked before decoding, and the image
+    dimensions as soon as the image header is decoded. A header
+    not found in the first MAX_HEADER_SIZE bytes is read from
+    the complete file. ASCII whitespace (e.g. line breaks of
+    wrapped base64) is ignored.
+
+    The limits default to the BASE64_IMAGE_MAX_SIZE (bytes),
+    BASE64_IMAGE_MAX_WIDTH and BASE64_IMAGE_MAX_HEIGHT settings.
+
+    """
+    CHUNK_SIZE = 64 * 1024
+    MAX_HEADER_SIZE = 1024 * 1024
+    WHITESPACE = re.compile(r'[ \t\n\r\f\v]')
+    default_error_messages = {
+        'invalid_base64': 'Некорректное изображение в формате base64.',
+        'max_size': 'Размер изображения не должен превышать {max_size} байт.',
+        'max_dimensions': ('Изображение не должно быть больше '
+                           '{max_width}x{max_height} пикселей.'),
+    }
+
+    def __init__(self, *args, max_size=None, max_width=None,
+                 max_height=None, **kwargs):
+        self.max_size = max_size
+        self.max_width = max_width
+        self.max_height = max_height
+        super().__init__(*args, **kwargs)
+
+    def get_limit(self, name):
+        value = getattr(self, name)
+        if value is None:
+            value = getattr(settings, f'BASE64_IMAGE_{name.upper()}')
+        return value
+
     def to_internal_value(self, data):
         if isinstance(data, str) and data.startswith('data:image'):
-            format, imgstr = data.split(';base64,')
-            ext = format.split('/')[-1]
-            data = ContentFile(base64.b64decode(imgstr), name='temp.' + ext)
+            data = self.decode(data)
 
         return super().to_internal_value(data)
 
+    def decode(self, data: str) -> UploadedFile:
+        """Decode the data URI into an uploaded file within the limits."""
+        separator_index = data.find(';base64,', 0, 256)
+        if separator_index == -1:
+            self.fail('invalid_base64')
+        content_type = data[len('data:'):separator_index]
+        name = 'temp.' + content_type.split('/')[-1]
+        offset = separator_index + len(';base64,')
+        if self.WHITESPACE.search(data, offset):
+            data, offset = self.WHITESPACE.sub('', data[offset:]), 0
+        size = (len(data) - offset) * 3 // 4 - (
+            len(data[-2:]) - len(data[-2:].rstrip('='))
+        )
+        max_size = self.get_limit('max_size')
+        if size > max_size:
+            self.fail('max_size', max_size=max_size)
+
+        if size > settings.FILE_UPLOAD_MAX_MEMORY_SIZE:
+            file = TemporaryUploadedFile(name, content_type, size, None)
+        else:
+            file = InMemoryUploadedFile(
+                BytesIO(), None, name, content_type, size, None,
+            )
+        dimensions_checked = False
+        for start in range(offset, len(data), self.CHUNK_SIZE):
+            try:
+                chunk = base64.b64decode(
+                    data[start:start + self.CHUNK_SIZE], validate=True,
+                )
+            except binascii.Error:
+                file.close()
+                self.fail('invalid_base64')
+            file.write(chunk)
+            if not dimensions_checked and file.tell() <= self.MAX_HEADER_SIZE:
+                dimensions_checked = self.check_dimensions(
+                    file, required=False,
+                )
+        if not dimensions_checked:
+            self.check_dimensions(file, required=True)
+        file.seek(0)
+        return file
+
+    def check_dimensions(self, file, required):
+        """
+        Validate the dimensions read from the image header
+        and return True, or False if the header is not decoded yet
+        (unless it is required to be).
+
+        """
+        position = file.tell()
+        file.seek(0)
+        try:
+            with Image.open(file.file) as image:
+                width, height = image.size
+        except Image.DecompressionBombError:
+            width = height = math.inf
+        except Exception:
+            if required:
+                file.close()
+                self.fail('invalid_image')
+            return False
+        finally:
+            file.seek(position)
+
+        max_width = self.get_limit('max_width')
+        max_height = self.get_limit('max_height')
+        if width > max_width or height > max_height:
+            file.close()
+            self.fail(
+                'max_dimensions', max_width=max_width, max_height=max_height,
+            )
+        return True
+
+
+class ImageVariantsField(serializers.ReadOnlyField):
+    """
+    Field for the URLs of the resized image variants by variant name
+    and format, e.g. {'card': {'jpeg': url, 'webp': url}}, empty
+    until the variants are rendered. The URLs are absolute
+    if the request is in the serializer context.
+
+    """
+
+    def to_representation(self, value):
+        request = self.context.get('request')
+        return {
+            variant: {
+                format: (
+                    request.build_absolute_uri(default_storage.url(name))
+                    if request else default_storage.url(name)
+                )
+                for format, name in files.items()
+            }
+            for variant, files in value.get('variants', {}).items()
+        }
+
 
 class IngredientUnitAmountSerializer(serializers.ModelSerializer):
     """Ingredient model serializer."""
@@ -163,16 +390,66 @@ class IngredientUnitAmountSerializer(serializers.ModelSerializer):
         return value
 
 
-class RecipeListDetailSerializer(serializers.ModelSerializer):
+class SparseFieldsetsMixin:
+    """
+    Serialize only the fields listed in the 'fields' query parameter
+    and not listed in the 'omit' one (both are comma-separated).
+    The id field is always serialized, unknown field names are ignored.
+
+    """
+    fields_query_param = 'fields'
+    omit_query_param = 'omit'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is not None:
+            self.restrict_fields(self.get_requested_fields(request))
+
+    def get_requested_fields(self, request) -> set[str]:
+        query_params = getattr(request, 'query_params', request.GET)
+        field_names = set(self.fields)
+        fields = query_params.get(self.fields_query_param)
+        if fields:
+            field_names &= set(fields.split(',')) | {'id'}
+        omit = query_params.get(self.omit_query_param)
+        if omit:
+            field_names -= set(omit.split(',')) - {'id'}
+        return field_names
+
+    def restrict_fields(self, field_names) -> None:
+        for field_name in set(self.fields).difference(field_names):
+            self.fields.pop(field_name)
+
+
+class RecipeListSerializer(serializers.ListSerializer):
+    """Serialize a list of recipes from their cached representations."""
+
+    def to_representation(self, data):
+        recipes = data.all() if isinstance(data, Manager) else data
+        return self.child.to_cached_representations(list(recipes))
+
+
+class RecipeListDetailSerializer(SparseFieldsetsMixin,
+                                 serializers.ModelSerializer):
+    """
+    Serializer for the recipe list and detail.
+
+    Everything but the request user's flags is the same for all users,
+    so it is serialized once, cached and only the user fields
+    are filled in for every request.
+
+    """
     image = Base64ImageField(required=True, allow_null=False)
+    image_variants = ImageVariantsField()
     tags = TagSerializer(many=True, read_only=True)
-    author = CustomUserSerializer()
+    author = AuthorSerializer()
     ingredients = IngredientUnitAmountSerializer(
         many=True,
         source='recipeingredientamount_set',
     )
-    is_favorited = serializers.BooleanField()
-    is_in_shopping_cart = serializers.BooleanField()
+    is_favorited = serializers.SerializerMethodField()
+    is_in_shopping_cart = serializers.SerializerMethodField()
 
     class Meta:
         model = Recipe
@@ -182,6 +459,7 @@ class RecipeListDetailSerializer(serializers.ModelSerializer):
             'name',
             'text',
             'image',
+            'image_variants',
             'cooking_time',
             'text',
             'tags',
@@ -189,10 +467,149 @@ class RecipeListDetailSerializer(serializers.ModelSerializer):
             'is_favorited',
             'is_in_shopping_cart',
         ]
+        list_serializer_class = RecipeListSerializer
+
+    def get_user_recipe_ids(self):
+        """
+        Return the request user's favorite and shopping cart recipe ids.
+
+        The ids are looked up once per serialization and shared
+        by all the serialized recipes through the serializer context.
+
+        """
+        if 'user_recipe_ids' not in self.context:
+            self.context['user_recipe_ids'] = get_user_recipe_ids(
+                self.get_request_user()
+            )
+        return self.context['user_recipe_ids']
+
+    def get_request_user(self):
+        request = self.context.get('request')
+        return request.user if request else AnonymousUser()
+
+    def get_is_favorited(self, obj):
+        return obj.id in self.get_user_recipe_ids()['favorites']
+
+    def get_is_in_shopping_cart(self, obj):
+        return obj.id in self.get_user_recipe_ids()['shopping_cart']
+
+    def to_representation(self, instance):
+        return self.to_cached_representations([instance])[0]
+
+    def to_cached_representations(self, recipes: list[Recipe]) -> list:
+        """
+        Return the representations of the given recipes.
+
+        The user-independent part is taken from the cache; the recipes
+        missing from the cache are fetched with the requested relations
+        in a fixed number of queries and serialized. Only complete
+        representations are put into the cache.
+
+        """
+        field_names = set(self.fields)
+        recipe_ids = [recipe.id for recipe in recipes]
+        representations = get_recipe_representations(recipe_ids)
+        missing_ids = set(recipe_ids).difference(representations)
+        if missing_ids:
+            shared_representations = {
+                recipe.id: self.to_shared_representation(recipe)
+                for recipe in self.get_shared_queryset(field_names).filter(
+                    id__in=missing_ids,
+                )
+            }
+            if field_names == set(self.Meta.fields):
+                set_recipe_representations(shared_representations)
+            representations.update(shared_representations)
+
+        if 'author' in field_names:
+            get_loader(self.context, SubscriptionLoader).prime(
+                representation['author']['id']
+                for representation in representations.values()
+            )
+        return [
+            self.add_user_fields(representations[recipe_id])
+            for recipe_id in recipe_ids
+            if recipe_id in representations
+        ]
+
+    @staticmethod
+    def get_shared_queryset(field_names):
+        """Return a queryset fetching only the requested relations."""
+        queryset = Recipe.objects.all()
+        if 'author' in field_names:
+            queryset = queryset.select_related('author')
+        if 'text' not in field_names:
+            queryset = queryset.defer('text')
+        if 'tags' in field_names:
+            queryset = queryset.prefetch_related('tags')
+        if 'ingredients' in field_names:
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    'recipeingredientamount_set',
+                    queryset=RecipeIngredientAmount.objects.select_related(
+                        'ingredient_unit__ingredient',
+                        'ingredient_unit__measurement_unit',
+                    ),
+                ),
+            )
+        return queryset
+
+    def to_shared_representation(self, instance):
+        """
+        Serialize the recipe without the request, so that
+        the user fields are left at their anonymous user values.
+
+        """
+        serializer = self.__class__(context={})
+        serializer.restrict_fields(self.fields)
+        return super(RecipeListDetailSerializer, serializer).to_representation(
+            instance
+        )
+
+    def add_user_fields(self, representation):
+        """
+        Add the request user's flags to the shared representation
+        limited to the requested fields.
+
+        """
+        representation = OrderedDict(
+            (field_name, value)
+            for field_name, value in representation.items()
+            if field_name in self.fields
+        )
+        if 'author' in representation:
+            representation['author'] = OrderedDict(representation['author'])
+            representation['author']['is_subscribed'] = get_loader(
+                self.context, SubscriptionLoader,
+            ).load(representation['author']['id'])
+        if 'is_favorited' in representation:
+            representation['is_favorited'] = (
+                representation['id']
+                in self.get_user_recipe_ids()['favorites']
+            )
+        if 'is_in_shopping_cart' in representation:
+            representation['is_in_shopping_cart'] = (
+                representation['id']
+                in self.get_user_recipe_ids()['shopping_cart']
+            )
+        request = self.context.get('request')
+        if request and representation.get('image'):
+            representation['image'] = request.build_absolute_uri(
+                representation['image']
+            )
+        if request and representation.get('image_variants'):
+            representation['image_variants'] = {
+                variant: {
+                    format: request.build_absolute_uri(url)
+                    for format, url in urls.items()
+                }
+                for variant, urls in representation['image_variants'].items()
+            }
+        return representation
 
 
 class RecipeCreateUpdateSerializer(serializers.ModelSerializer):
-    author = CustomUserSerializer(
+    author = AuthorSerializer(
         default=serializers.CurrentUserDefault(),
         read_only=True,
     )
@@ -225,17 +642,22 @@ class RecipeCreateUpdateSerializer(serializers.ModelSerializer):
 
     def validate_ingredients(self, ingredients):
         """Validate that ingredients field is not empty, and
-        contains valid ingredient_unit ids."""
+        contains valid ingredient_unit ids (looked up in one query)."""
         if len(ingredients) == 0:
             raise serializers.ValidationError(
                 'Необходимо добавить хотя бы один ингредиент.'
             )
 
-        for ingredient in ingredients:
-            ingr_unit_id = ingredient['ingredient_unit']['id']
-            if not IngredientUnit.objects.filter(
-                pk=ingr_unit_id
-            ).exists():
+        ingr_unit_ids = [
+            ingredient['ingredient_unit']['id'] for ingredient in ingredients
+        ]
+        existing_ids = set(
+            IngredientUnit.objects.filter(
+                pk__in=ingr_unit_ids,
+            ).values_list('pk', flat=True)
+        )
+        for ingr_unit_id in ingr_unit_ids:
+            if ingr_unit_id not in existing_ids:
                 raise serializers.ValidationError(
                     f'Ингредиент с id '
                     f'{ingr_unit_id} '
@@ -263,16 +685,22 @@ class RecipeCreateUpdateSerializer(serializers.ModelSerializer):
             recipe: Recipe,
             ingredients: list[OrderedDict]
     ) -> None:
-        for ingredient in ingredients:
-            ingr_unit_id = ingredient['ingredient_unit']['id']
-            ingr_unit = IngredientUnit.objects.get(
-                pk=ingr_unit_id,
-            )
-            RecipeIngredientAmount.objects.create(
+        """
+        Insert the recipe ingredient amounts with a single query.
+
+        bulk_create does not send post_save; the cached representation
+        of the recipe is invalidated when the recipe itself is saved
+        in the same transaction, and once again when it commits.
+
+        """
+        RecipeIngredientAmount.objects.bulk_create(
+            RecipeIngredientAmount(
                 recipe=recipe,
                 amount=ingredient['amount'],
-                ingredient_unit=ingr_unit,
+                ingredient_unit_id=ingredient['ingredient_unit']['id'],
             )
+            for ingredient in ingredients
+        )
 
     def create(self, validated_data):
         ingredients = validated_data.pop('recipeingredientamount_set')
@@ -282,7 +710,7 @@ class RecipeCreateUpdateSerializer(serializers.ModelSerializer):
                 recipe = Recipe.objects.create(**validated_data)
                 self.__add_ingredients(recipe, ingredients)
                 recipe.tags.add(*tags)
-                recipe.save()
+                FeedEntry.objects.fan_out(recipe)
         except DatabaseError:
             raise serializers.ValidationError(
                 'Не удалось создать рецепт. '
@@ -291,26 +719,93 @@ class RecipeCreateUpdateSerializer(serializers.ModelSerializer):
 
         return recipe
 
+    def __update_ingredients(
+            self,
+            recipe: Recipe,
+            ingredients: list[OrderedDict]
+    ) -> dict[int, int]:
+        """
+        Apply the difference between the stored and the submitted
+        ingredient amounts with only the deletes, updates and inserts
+        that are needed. Return the amount changes by ingredient unit id.
+
+        """
+        stored_amounts = {
+            ingredient_amount.ingredient_unit_id: ingredient_amount
+            for ingredient_amount in recipe.recipeingredientamount_set.all()
+        }
+        submitted_amounts = {
+            ingredient['ingredient_unit']['id']: ingredient['amount']
+            for ingredient in ingredients
+        }
+        amount_changes = {}
+        deleted_ids = []
+        changed_amounts = []
+        for ingr_unit_id, ingredient_amount in stored_amounts.items():
+            amount = submitted_amounts.get(ingr_unit_id, 0)
+            if amount == ingredient_amount.amount:
+                continue
+            amount_changes[ingr_unit_id] = amount - ingredient_amount.amount
+            if amount:
+                ingredient_amount.amount = amount
+                changed_amounts.append(ingredient_amount)
+            else:
+                deleted_ids.append(ingredient_amount.pk)
+        new_ingredients = [
+            ingredient for ingredient in ingredients
+            if ingredient['ingredient_unit']['id'] not in stored_amounts
+        ]
+        for ingredient in new_ingredients:
+            amount_changes[ingredient['ingredient_unit']['id']] = (
+                ingredient['amount']
+            )
+
+        if deleted_ids:
+            RecipeIngredientAmount.objects.filter(pk__in=deleted_ids).delete()
+        if changed_amounts:
+            RecipeIngredientAmount.objects.bulk_update(
+                changed_amounts, ['amount'],
+            )
+        if new_ingredients:
+            self.__add_ingredients(recipe, new_ingredients)
+        return amount_changes
+
     def update(self, recipe, validated_data):
-        tags = validated_data.pop('tags')
+        """
+        Update the recipe with a single row write, changing only
+        the tags and ingredient amounts that differ from the stored
+        ones. The tags are set by ModelSerializer.update().
+
+        """
         ingredients = validated_data.pop('recipeingredientamount_set')
         try:
             with transaction.atomic():
-                recipe.tags.clear()
-                recipe.tags.add(*tags)
-
-                recipe.ingredients.clear()
-                self.__add_ingredients(recipe, ingredients)
-                recipe.save()
+                amount_changes = self.__update_ingredients(
+                    recipe, ingredients,
+                )
+                ShoppingCartIngredient.objects.change_recipe_amounts(
+                    recipe, amount_changes,
+                )
+                recipe = super().update(recipe, validated_data)
         except DatabaseError:
             raise serializers.ValidationError(
                 f'Не удалось отредактировать рецепт - {recipe.name}. '
                 f'Возможно, у Вас уже есть рецепт с таким названием.'
             )
 
-        return super().update(recipe, validated_data)
+        return recipe
 
     def to_representation(self, instance):
+        prefetch_related_objects(
+            [instance],
+            Prefetch(
+                'recipeingredientamount_set',
+                queryset=RecipeIngredientAmount.objects.select_related(
+                    'ingredient_unit__ingredient',
+                    'ingredient_unit__measurement_unit',
+                ),
+            ),
+        )
         representation = super().to_representation(instance)
         representation['tags'] = TagSerializer(
             instance.tags,
@@ -319,7 +814,38 @@ class RecipeCreateUpdateSerializer(serializers.ModelSerializer):
         return representation
 
 
+class RecipeIdsSerializer(serializers.Serializer):
+    """Serializer for a list of recipe ids of a bulk request."""
+    MAX_RECIPES = 100
+
+    recipes = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_RECIPES,
+    )
+
+    def validate_recipes(self, recipes):
+        """Drop duplicate ids keeping the order of the rest."""
+        return list(dict.fromkeys(recipes))
+
+
+class AuthorIdsSerializer(serializers.Serializer):
+    """Serializer for a list of author ids of a bulk subscribe request."""
+    MAX_AUTHORS = 100
+
+    authors = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_AUTHORS,
+    )
+
+    def validate_authors(self, authors):
+        """Drop duplicate ids keeping the order of the rest."""
+        return list(dict.fromkeys(authors))
+
+
 class RecipeBriefInfoSerializer(serializers.ModelSerializer):
+    image_variants = ImageVariantsField()
 
     class Meta:
         model = Recipe
@@ -327,6 +853,7 @@ class RecipeBriefInfoSerializer(serializers.ModelSerializer):
             'id',
             'name',
             'image',
+            'image_variants',
             'cooking_time',
         ]
 
@@ -338,11 +865,9 @@ class SubscriptionSerializer(serializers.ModelSerializer):
     first_name = serializers.CharField(source='author.first_name')
     last_name = serializers.CharField(source='author.last_name')
     email = serializers.CharField(source='author.email')
-    recipes = RecipeBriefInfoSerializer(
-        many=True, read_only=True, source='author.recipes'
-    )
+    recipes = serializers.SerializerMethodField()
     is_subscribed = serializers.SerializerMethodField()
-    recipes_count = serializers.SerializerMethodField()
+    recipes_count = serializers.IntegerField(source='author.recipes_count')
 
     class Meta:
         model = Subscription
@@ -360,5 +885,15 @@ class SubscriptionSerializer(serializers.ModelSerializer):
     def get_is_subscribed(self, obj):
         return True
 
-    def get_recipes_count(self, obj):
-        return obj.author.recipes.count()
+    def get_recipes(self, obj):
+        """
+        Return the author's recipes, limited to the latest ones
+        if they are prefetched as latest_recipes.
+
+        """
+        recipes = getattr(obj.author, 'latest_recipes', None)
+        if recipes is None:
+            recipes = obj.author.recipes.all()
+        return RecipeBriefInfoSerializer(
+            recipes, many=True, context=self.context,
+        ).data
@@ -0,0 +1,153 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+
+from api.cache import (
+    bump_versions,
+    invalidate_recipe_representations,
+    invalidate_user_recipe_ids,
+    user_version_name,
+)
+from recipes.image_variants import image_variants_rendered
+from recipes.ingredient_index import schedule_ingredient_index_rebuild
+from recipes.models import (
+    Ingredient,
+    IngredientUnit,
+    MeasurementUnit,
+    Recipe,
+    RecipeIngredientAmount,
+    Tag,
+)
+from users.models import Subscription
+
+User = get_user_model()
+
+USER_RECIPES_CHANGE_ACTIONS = ('post_add', 'post_remove', 'pre_clear')
+
+
+def _changed_instance_ids(instance, action, reverse, pk_set, field_name):
+    """
+    Return ids of the instances on the forward side of a many-to-many
+    relation that is being changed.
+
+    Changes made from the reverse side (user.favorites.add(recipe))
+    have the changed instance itself as the instance.
+
+    """
+    if reverse:
+        return {instance.pk}
+    if action == 'pre_clear':
+        return set(
+            getattr(instance, field_name).values_list('pk', flat=True)
+        )
+    return pk_set or set()
+
+
+@receiver(m2m_changed, sender=Recipe.adds_to_favorites.through)
+def favorites_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action in USER_RECIPES_CHANGE_ACTIONS:
+        user_ids = _changed_instance_ids(
+            instance, action, reverse, pk_set, 'adds_to_favorites',
+        )
+        invalidate_user_recipe_ids(user_ids, 'favorites')
+
+
+@receiver(m2m_changed, sender=Recipe.shopping_cart_adds.through)
+def shopping_cart_changed(sender, instance, action, reverse, pk_set,
+                          **kwargs):
+    if action in USER_RECIPES_CHANGE_ACTIONS:
+        user_ids = _changed_instance_ids(
+            instance, action, reverse, pk_set, 'shopping_cart_adds',
+        )
+        invalidate_user_recipe_ids(user_ids, 'shopping_cart')
+
+
+@receiver(post_save, sender=Recipe)
+@receiver(post_delete, sender=Recipe)
+def recipe_changed(sender, instance, **kwargs):
+    invalidate_recipe_representations([instance.pk])
+
+
+@receiver(image_variants_rendered, sender=Recipe)
+def recipe_image_variants_rendered(sender, recipe_id, **kwargs):
+    invalidate_recipe_representations([recipe_id])
+
+
+@receiver(post_save, sender=RecipeIngredientAmount)
+@receiver(post_delete, sender=RecipeIngredientAmount)
+def recipe_ingredient_changed(sender, instance, **kwargs):
+    invalidate_recipe_representations([instance.recipe_id])
+
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def recipe_tags_changed(sender, instance, action, reverse, pk_set,
+                        **kwargs):
+    if action in USER_RECIPES_CHANGE_ACTIONS:
+        if reverse:
+            recipe_ids = (
+                pk_set if action != 'pre_clear'
+                else instance.recipes.values_list('pk', flat=True)
+            )
+        else:
+            recipe_ids = [instance.pk]
+        invalidate_recipe_representations(recipe_ids)
+
+
+@receiver(post_save, sender=Tag)
+@receiver(pre_delete, sender=Tag)
+def tag_changed(sender, instance, created=False, **kwargs):
+    bump_versions('tags')
+    if created:
+        return
+    invalidate_recipe_representations(
+        instance.recipes.values_list('pk', flat=True)
+    )
+
+
+@receiver(post_save, sender=Ingredient)
+@receiver(post_save, sender=MeasurementUnit)
+def ingredient_changed(sender, instance, created=False, **kwargs):
+    bump_versions('ingredients')
+    schedule_ingredient_index_rebuild()
+    if created:
+        return
+    lookup = {
+        Ingredient: 'ingredients__ingredient',
+        MeasurementUnit: 'ingredients__measurement_unit',
+    }[sender]
+    invalidate_recipe_representations(
+        Recipe.objects.filter(
+            **{lookup: instance},
+        ).values_list('pk', flat=True).distinct()
+    )
+
+
+@receiver(post_save, sender=User)
+def author_changed(sender, instance, created=False, update_fields=None,
+                   **kwargs):
+    if created or update_fields and set(update_fields) == {'last_login'}:
+        return
+    bump_versions('users')
+    invalidate_recipe_representations(
+        instance.recipes.values_list('pk', flat=True)
+    )
+
+
+@receiver(post_delete, sender=Ingredient)
+@receiver(post_delete, sender=MeasurementUnit)
+@receiver(post_save, sender=IngredientUnit)
+@receiver(post_delete, sender=IngredientUnit)
+def ingredient_catalog_changed(sender, **kwargs):
+    bump_versions('ingredients')
+    schedule_ingredient_index_rebuild()
+
+
+@receiver(post_save, sender=Subscription)
+@receiver(post_delete, sender=Subscription)
+def subscription_changed(sender, instance, **kwargs):
+    bump_versions(user_version_name(instance.user_id))
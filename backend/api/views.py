@@ -1,6 +1,8 @@
 from django.contrib.auth import get_user_model
-from django.db.models import Case, QuerySet, Sum, When
-from django.http import HttpResponse
+from django.db import IntegrityError, router, transaction
+from django.db.models import Prefetch, QuerySet, prefetch_related_objects
+from django.db.models.signals import m2m_changed
+from django.http import StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from djoser.conf import settings
 from djoser.views import UserViewSet as DjoserUserViewSet
@@ -12,16 +14,33 @@ from rest_framework.permissions import (
 )
 from rest_framework.response import Response
 
+from api.cache import bump_versions, get_versions, user_version_name
+from api.db import insert_ignoring_conflicts
+from api.exporters import SHOPPING_CART_EXPORTERS, TextExporter, get_exporter
 from api.filters import IngredientFilter, RecipeFilter
+from api.mixins import (
+    NANOSECONDS,
+    ConditionalGetMixin,
+    IngredientIndexSearchMixin,
+    ValuesListMixin,
+)
+from api.pagination import (
+    FavoritesPagination,
+    FeedPagination,
+    IngredientPagination,
+    RecipePagination,
+)
 from api.permissions import IsObjOwnerOrAdminOrReadOnly
 from api.serializers import (
+    AuthorIdsSerializer,
     IngredientUnitSerializer,
     RecipeBriefInfoSerializer,
     RecipeCreateUpdateSerializer,
+    RecipeIdsSerializer,
     RecipeListDetailSerializer,
     TagSerializer,
 )
-from recipes.models import IngredientUnit, Recipe, Tag
+from recipes.models import Favorite, FeedEntry, IngredientUnit, Recipe, Tag
 from users.models import Subscription
 
 User = get_user_model()
@@ -36,67 +55,201 @@ class CustomUserViewSet(DjoserUserViewSet):
     subscribe:
     Add/remove the given user to/from the request user's subscriptions.
 
+    bulk_subscribe:
+    Add/remove the given list of users to/from the request user's
+    subscriptions.
+
     subscriptions:
     Return a list of all exisiting request user's subscriptions.
 
+    The recipes of the authors can be limited with
+    the recipes_limit query parameter.
+
     """
+    recipes_limit_query_param = 'recipes_limit'
+
     def get_serializer_class(self):
         if self.action in ('subscriptions', 'subscribe'):
             return settings.SERIALIZERS.subscriptions
+        if self.action == 'bulk_subscribe':
+            return AuthorIdsSerializer
         return super().get_serializer_class()
 
     def get_queryset(self):
         user = self.request.user
         if self.action == 'subscriptions':
-            return user.subscriptions.all()
-        return super().get_queryset()
+            return self.get_subscriptions_queryset(user.subscriptions.all())
+        return super().get_queryset().order_by('id')
+
+    def get_recipes_limit(self):
+        try:
+            recipes_limit = int(
+                self.request.query_params[self.recipes_limit_query_param]
+            )
+        except (KeyError, ValueError):
+            return None
+        return recipes_limit if recipes_limit > 0 else None
+
+    def get_latest_recipes_prefetch(self):
+        """
+        Return the prefetch of the subscription authors' latest recipes
+        (up to recipes_limit per author) as their latest_recipes.
+
+        """
+        recipes = Recipe.objects.only(
+            'id', 'name', 'image', 'image_variants', 'cooking_time',
+            'author',
+        ).order_by('-pub_date', 'name', 'id')
+        recipes_limit = self.get_recipes_limit()
+        if recipes_limit is not None:
+            recipes = recipes[:recipes_limit]
+        return Prefetch(
+            'author__recipes', queryset=recipes, to_attr='latest_recipes',
+        )
+
+    def get_subscriptions_queryset(self, subscriptions):
+        """
+        Return the subscriptions with their authors and the authors'
+        latest recipes, fetched in a fixed number of queries.
+
+        """
+        return subscriptions.select_related('author').prefetch_related(
+            self.get_latest_recipes_prefetch(),
+        ).order_by('id')
 
     @action(["post", "delete"],
             detail=True,
             permission_classes=[IsAuthenticated])
     def subscribe(self, request, *args, **kwargs):
+        """
+        Subscribe/unsubscribe the request user to/from the given user
+        with a single insert or delete, the database constraints
+        rejecting the subscriptions that already exist.
+
+        """
         recipe_author = self.get_object()
         current_user = self.get_instance()
-        subcription = Subscription.objects.filter(
-            user=current_user,
-            author=recipe_author
-        )
         if request.method == 'POST':
-            if recipe_author != current_user:
-                if not subcription.exists():
-                    Subscription.objects.create(
-                        user=current_user, author=recipe_author
-                    )
-                    serializer = self.get_serializer(subcription.first()).data
-                    return Response(
-                        status=status.HTTP_201_CREATED,
-                        data=serializer,
+            if recipe_author == current_user:
+                return Response(
+                    status=status.HTTP_400_BAD_REQUEST,
+                    data={
+                        'errors': ('Текущий пользователь не может '
+                                   'подписываться на себя'),
+                    })
+            try:
+                with transaction.atomic():
+                    subscription = Subscription.objects.create(
+                        user=current_user, author=recipe_author,
                     )
+                    FeedEntry.objects.backfill(current_user, recipe_author)
+            except IntegrityError:
                 return Response(
                     status=status.HTTP_400_BAD_REQUEST,
                     data={
                         'errors': (f'Пользователь {current_user.username} уже '
                                    f'подписан на {recipe_author.username}'),
                     })
+            prefetch_related_objects(
+                [subscription], self.get_latest_recipes_prefetch(),
+            )
+            serializer = self.get_serializer(subscription).data
             return Response(
-                status=status.HTTP_400_BAD_REQUEST,
-                data={
-                    'errors': ('Текущий пользователь не может '
-                               'подписываться на себя'),
-                })
+                status=status.HTTP_201_CREATED,
+                data=serializer,
+            )
 
         elif request.method == 'DELETE':
-            if subcription.exists():
-                subcription.delete()
+            with transaction.atomic():
+                deleted, _ = Subscription.objects.filter(
+                    user=current_user,
+                    author=recipe_author,
+                ).delete()
+                if deleted:
+                    FeedEntry.objects.prune(current_user, recipe_author)
+            if deleted:
                 return Response(status=status.HTTP_204_NO_CONTENT)
             return Response(status=status.HTTP_400_BAD_REQUEST,
                             data={
                                 'errors': (f'Пользователь '
                                            f'{current_user.username} '
-                                           f'уже подписан на '
+                                           f'не подписан на '
                                            f'{recipe_author.username}'),
                             })
 
+    @action(["post", "delete"],
+            detail=False,
+            url_path='subscribe',
+            url_name='bulk-subscribe',
+            permission_classes=[IsAuthenticated])
+    def bulk_subscribe(self, request, *args, **kwargs):
+        """
+        Subscribe/unsubscribe the request user to/from the given users
+        in one transaction and return the result for each user id.
+        The request user's own id is reported as not found.
+
+        The subscriptions are inserted with a single query, so
+        the counters, the feed and the cached versions are updated here
+        instead of the post_save signal receivers, only for the rows
+        the query actually inserted.
+
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        author_ids = serializer.validated_data['authors']
+
+        current_user = request.user
+        authors = {
+            author.pk: author
+            for author in User.objects.filter(
+                pk__in=author_ids,
+            ).exclude(pk=current_user.pk).only('pk')
+        }
+        with transaction.atomic():
+            subscribed_ids = set(
+                Subscription.objects.filter(
+                    user=current_user, author__in=authors,
+                ).values_list('author', flat=True)
+            )
+            if request.method == 'POST':
+                changed_ids = insert_ignoring_conflicts(
+                    Subscription,
+                    (
+                        Subscription(user=current_user, author_id=author_id)
+                        for author_id in set(authors) - subscribed_ids
+                    ),
+                    returning='author',
+                )
+                FeedEntry.objects.backfill(current_user, *changed_ids)
+                if changed_ids:
+                    User.objects.change_counter(
+                        changed_ids, 'followers_count', 1,
+                    )
+                    User.objects.change_counter(
+                        [current_user.pk], 'following_count', len(changed_ids),
+                    )
+                    bump_versions(user_version_name(current_user.pk))
+                statuses = ('subscribed', 'already_subscribed')
+            else:
+                changed_ids = subscribed_ids
+                Subscription.objects.filter(
+                    user=current_user, author__in=changed_ids,
+                ).delete()
+                FeedEntry.objects.prune(current_user, *changed_ids)
+                statuses = ('unsubscribed', 'already_unsubscribed')
+
+        results = [
+            {
+                'id': author_id,
+                'status': (
+                    'not_found' if author_id not in authors
+                    else statuses[author_id not in changed_ids]
+                ),
+            }
+            for author_id in author_ids
+        ]
+        return Response(status=status.HTTP_200_OK, data={'results': results})
+
     @action(["get"],
             detail=False,
             permission_classes=[IsAuthenticated])
@@ -104,24 +257,37 @@ class CustomUserViewSet(DjoserUserViewSet):
         return self.list(request, *args, **kwargs)
 
 
-class IngredientReadOnlyViewset(viewsets.ReadOnlyModelViewSet):
+class IngredientReadOnlyViewset(ConditionalGetMixin,
+                                IngredientIndexSearchMixin,
+                                ValuesListMixin,
+                                viewsets.ReadOnlyModelViewSet):
     """
     list:
     Return a list of all ingredients with measurement units.
+    Searches by name are served from the shared ingredient index.
+    Sending the cursor query parameter (empty for the first page)
+    paginates the list, with the limit parameter as the page size.
 
     retrieve:
     Return the given ingredient with the measurement unit.
 
     """
-    queryset = IngredientUnit.objects.all()
+    queryset = IngredientUnit.objects.select_related(
+        'ingredient', 'measurement_unit',
+    )
     serializer_class = IngredientUnitSerializer
     filter_backends = (DjangoFilterBackend,)
     filterset_class = IngredientFilter
-    pagination_class = None
+    pagination_class = IngredientPagination
     permission_classes = (IsAuthenticatedOrReadOnly,)
 
+    def get_versions(self, request, *args, **kwargs):
+        return get_versions('ingredients')
+
 
-class TagReadOnlyViewset(viewsets.ReadOnlyModelViewSet):
+class TagReadOnlyViewset(ConditionalGetMixin,
+                         ValuesListMixin,
+                         viewsets.ReadOnlyModelViewSet):
     """
     list:
     Return a list of all existing recipe tags.
@@ -135,12 +301,16 @@ class TagReadOnlyViewset(viewsets.ReadOnlyModelViewSet):
     pagination_class = None
     permission_classes = (IsAuthenticatedOrReadOnly,)
 
+    def get_versions(self, request, *args, **kwargs):
+        return get_versions('tags')
 
-class RecipeViewset(viewsets.ModelViewSet):
+
+class RecipeViewset(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     list:
     Return a list of all existing recipes filtered by pub_date
-    in descending order.
+    in descending order. Paginated by page number or, if the cursor
+    query parameter is sent, by keyset.
 
     retrieve:
     Return the given recipe.
@@ -160,54 +330,99 @@ class RecipeViewset(viewsets.ModelViewSet):
     shopping_cart:
     Add/delete the given recipe to/from the request user's shopping_cart.
 
+    bulk_favorite:
+    Add/delete the given recipes to/from the request user's favorites.
+
+    bulk_shopping_cart:
+    Add/delete the given recipes to/from the request user's shopping_cart.
+
     download_shopping_cart:
-    Download a text file with all ingredients
+    Download a file (txt, csv, json or md) with all ingredients
     and their amounts from the shopping cart recipes.
 
+    favorites:
+    Return the recipes from the request user's favorites,
+    most recently added first, paginated by keyset.
+
+    feed:
+    Return the recipes of the authors the request user is subscribed to,
+    newest first, paginated by keyset.
+
     """
 
     serializer_class = RecipeListDetailSerializer
     filter_backends = (DjangoFilterBackend,)
     filterset_class = RecipeFilter
+    pagination_class = RecipePagination
     permission_classes = (IsObjOwnerOrAdminOrReadOnly,)
 
     def get_queryset(self):
-        if self.request.user.is_anonymous:
-            user_favorites = []
-            user_shopping_cart = []
-        else:
-            user_favorites = self.request.user.favorites.all()
-            user_shopping_cart = self.request.user.shopping_cart.all()
-
-        queryset = Recipe.objects.select_related(
+        if self.action in ('list', 'retrieve'):
+            #  recipe representations are served from the cache
+            #  by RecipeListDetailSerializer, which fetches the relations
+            #  of the cache misses itself.
+            return Recipe.objects.only('id', 'name', 'pub_date')
+        if self.action in (
+            'favorite', 'shopping_cart', 'bulk_favorite', 'bulk_shopping_cart',
+        ):
+            return Recipe.objects.only(
+                'id', 'name', 'image', 'image_variants', 'cooking_time',
+            )
+        if self.action == 'destroy':
+            return Recipe.objects.select_related('author')
+        return Recipe.objects.select_related(
             'author',
         ).prefetch_related(
             'tags',
             'ingredients',
-        ).annotate(
-            is_favorited=Case(
-                When(
-                    id__in=user_favorites,
-                    then=True,
-                ),
-                default=False,
-            )
-        ).annotate(
-            is_in_shopping_cart=Case(
-                When(
-                    id__in=user_shopping_cart,
-                    then=True,
-                ),
-                default=False,
-            )
         )
-        return queryset
+
+    def get_versions(self, request, *args, **kwargs):
+        """
+        Return the versions of the recipe list or the given recipe
+        and of the request user's favorites, shopping cart
+        and subscriptions.
+
+        """
+        version_names = []
+        if request.user.is_authenticated:
+            version_names.append(user_version_name(request.user.pk))
+
+        if self.action == 'list':
+            return get_versions('recipes', *version_names)
+
+        try:
+            updated_at = Recipe.objects.filter(
+                pk=kwargs['pk'],
+            ).values_list('updated_at', flat=True).first()
+        except (TypeError, ValueError):
+            return None
+        if updated_at is None:
+            return None
+        versions = get_versions('tags', 'ingredients', 'users', *version_names)
+        versions['recipe'] = (
+            int(updated_at.timestamp()) * NANOSECONDS
+            + updated_at.microsecond * 1000
+        )
+        return versions
+
+    def perform_content_negotiation(self, request, force=False):
+        """
+        Do not treat the format query parameter of the shopping cart
+        download as a renderer format.
+
+        """
+        if self.action == 'download_shopping_cart':
+            force = True
+        return super().perform_content_negotiation(request, force=force)
 
     def get_serializer_class(self):
         if self.action in ('create', 'partial_update', 'update'):
             return RecipeCreateUpdateSerializer
         elif self.action in ('favorite', 'shopping_cart'):
             return RecipeBriefInfoSerializer
+        elif self.action in ('bulk_favorite', 'bulk_shopping_cart'):
+            return RecipeIdsSerializer
         return self.serializer_class
 
     def perform_create(self, serializer):
@@ -235,28 +450,104 @@ class RecipeViewset(viewsets.ModelViewSet):
         user_items_name = 'shopping_cart'
         return self.__handle_extra_action(request, recipe, user_items_name)
 
+    @action(methods=['post', 'delete'],
+            detail=False,
+            url_path='favorite',
+            url_name='bulk-favorite',
+            permission_classes=[IsAuthenticated])
+    def bulk_favorite(self, request):
+        """
+        Add/delete the given recipes to/from the request user's favorites
+        and return the result for each recipe id.
+
+        """
+        return self.__handle_bulk_extra_action(request, 'favorites')
+
+    @action(methods=['post', 'delete'],
+            detail=False,
+            url_path='shopping_cart',
+            url_name='bulk-shopping-cart',
+            permission_classes=[IsAuthenticated])
+    def bulk_shopping_cart(self, request):
+        """
+        Add/delete the given recipes to/from the request user's
+        shopping_cart and return the result for each recipe id.
+
+        """
+        return self.__handle_bulk_extra_action(request, 'shopping_cart')
+
     @action(methods=['get'],
             detail=False,
             permission_classes=[IsAuthenticated])
     def download_shopping_cart(self, request, pk=None):
         """
-        Download a text file with ingredients and their amounts
+        Download a file with ingredients and their amounts
         from the shopping cart recipes.
 
+        The file format is set by the format query parameter
+        (txt by default). The file is streamed row by row.
+
         """
+        exporter = get_exporter(
+            request.query_params.get('format', TextExporter.format)
+        )
+        if exporter is None:
+            return Response(
+                status=status.HTTP_400_BAD_REQUEST,
+                data={
+                    'errors': 'Формат не поддерживается. Доступные форматы: '
+                              f'{", ".join(SHOPPING_CART_EXPORTERS)}.',
+                },
+            )
         shopping_cart_data = self.__get_shopping_cart_ingredients(
             self.request.user
         )
-        readable_data = self.convert_to_readable_data(shopping_cart_data)
-        response = HttpResponse(
-            readable_data,
+        return StreamingHttpResponse(
+            exporter.export(shopping_cart_data.iterator()),
             headers={
-                "Content-Type": "text/plain",
-                "Content-Disposition": ('attachment; '
-                                        'filename="ingredients.txt"'),
+                'Content-Type': exporter.content_type,
+                'Content-Disposition': (
+                    'attachment; '
+                    f'filename="ingredients.{exporter.extension}"'
+                ),
             },
         )
-        return response
+
+    @action(methods=['get'],
+            detail=False,
+            permission_classes=[IsAuthenticated],
+            pagination_class=FeedPagination)
+    def feed(self, request):
+        """
+        Return the recipes from the request user's materialized
+        subscription feed.
+
+        """
+        feed_entries = FeedEntry.objects.filter(
+            subscriber=request.user,
+        ).only('id', 'recipe', 'created_at')
+        page = self.paginate_queryset(feed_entries)
+        recipes = [Recipe(pk=entry.recipe_id) for entry in page]
+        serializer = self.get_serializer(recipes, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(methods=['get'],
+            detail=False,
+            permission_classes=[IsAuthenticated],
+            pagination_class=FavoritesPagination)
+    def favorites(self, request):
+        """
+        Return the recipes from the request user's favorites,
+        most recently added first.
+
+        """
+        favorites = Favorite.objects.filter(
+            user=request.user,
+        ).only('id', 'recipe', 'created_at')
+        page = self.paginate_queryset(favorites)
+        recipes = [Recipe(pk=favorite.recipe_id) for favorite in page]
+        serializer = self.get_serializer(recipes, many=True)
+        return self.get_paginated_response(serializer.data)
 
     def __handle_extra_action(self, request, recipe, user_items_name):
         user = self.request.user
@@ -278,28 +569,54 @@ class RecipeViewset(viewsets.ModelViewSet):
         return Response(status=status.HTTP_405_METHOD_NOT_ALLOWED)
 
     def __add_to_user_items(self, user, recipe, user_items_set):
-        error_message = f'Рецепт "{recipe.name}" уже добавлен.'
+        """
+        Add the recipe to the user's items with a single insert,
+        the unique constraint of the relation table rejecting
+        the recipes that are already there.
 
-        if recipe not in user_items_set.all():
-            user_items_set.add(recipe)
-            user.save()
-            serializer = self.get_serializer(recipe).data
-            return Response(
-                status=status.HTTP_201_CREATED,
-                data=serializer,
-            )
+        """
+        error_message = f'Рецепт "{recipe.name}" уже добавлен.'
+        through = user_items_set.through
+
+        try:
+            with transaction.atomic():
+                self.__send_m2m_changed(user, through, 'pre_add', [recipe.pk])
+                through.objects.create(user=user, recipe=recipe)
+                self.__send_m2m_changed(
+                    user, through, 'post_add', [recipe.pk],
+                )
+        except IntegrityError:
+            return Response(status=status.HTTP_400_BAD_REQUEST,
+                            data={
+                                'errors': error_message,
+                            })
 
-        return Response(status=status.HTTP_400_BAD_REQUEST,
-                        data={
-                            'errors': error_message,
-                        })
+        serializer = self.get_serializer(recipe).data
+        return Response(
+            status=status.HTTP_201_CREATED,
+            data=serializer,
+        )
 
     def __remove_from_user_items(self, user, recipe, user_items_set):
-        error_message = f'Рецепт "{recipe.name}" уже удален.'
+        """
+        Remove the recipe from the user's items with a single delete,
+        the number of deleted rows telling whether it was there.
 
-        if recipe in user_items_set.all():
-            user_items_set.remove(recipe)
-            user.save()
+        """
+        error_message = f'Рецепт "{recipe.name}" уже удален.'
+        through = user_items_set.through
+
+        with transaction.atomic():
+            self.__send_m2m_changed(user, through, 'pre_remove', [recipe.pk])
+            deleted, _ = through.objects.filter(
+                user=user, recipe=recipe,
+            ).delete()
+            if deleted:
+                self.__send_m2m_changed(
+                    user, through, 'post_remove', [recipe.pk],
+                )
+
+        if deleted:
             return Response(status=status.HTTP_204_NO_CONTENT)
 
         return Response(status=status.HTTP_400_BAD_REQUEST,
@@ -307,33 +624,102 @@ class RecipeViewset(viewsets.ModelViewSet):
                             'errors': error_message,
                         })
 
+    def __handle_bulk_extra_action(self, request, user_items_name):
+        """
+        Add/delete the recipes to/from the user's items in one
+        transaction with a single insert or delete query.
+
+        The rows are written to the relation table directly, so
+        m2m_changed is sent explicitly for the recipes actually added
+        or deleted, as the user_items_set.add()/remove() would do.
+        The added recipes are the ones returned by the insert, so
+        the rows inserted by concurrent requests are not counted.
+
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        recipe_ids = serializer.validated_data['recipes']
+
+        user = request.user
+        user_items_set = getattr(user, user_items_name)
+        through = user_items_set.through
+        existing_ids = set(
+            Recipe.objects.filter(pk__in=recipe_ids).values_list(
+                'pk', flat=True,
+            )
+        )
+        with transaction.atomic():
+            if request.method == 'POST':
+                self.__send_m2m_changed(user, through, 'pre_add', existing_ids)
+                changed_ids = insert_ignoring_conflicts(
+                    through,
+                    (
+                        through(user=user, recipe_id=recipe_id)
+                        for recipe_id in existing_ids
+                    ),
+                    returning='recipe',
+                )
+                self.__send_m2m_changed(user, through, 'post_add', changed_ids)
+                statuses = ('added', 'already_added')
+            else:
+                changed_ids = set(
+                    through.objects.filter(
+                        user=user, recipe__in=existing_ids,
+                    ).values_list('recipe', flat=True)
+                )
+                self.__send_m2m_changed(
+                    user, through, 'pre_remove', changed_ids,
+                )
+                through.objects.filter(
+                    user=user, recipe__in=changed_ids,
+                ).delete()
+                self.__send_m2m_changed(
+                    user, through, 'post_remove', changed_ids,
+                )
+                statuses = ('removed', 'already_removed')
+
+        results = [
+            {
+                'id': recipe_id,
+                'status': (
+                    'not_found' if recipe_id not in existing_ids
+                    else statuses[recipe_id not in changed_ids]
+                ),
+            }
+            for recipe_id in recipe_ids
+        ]
+        return Response(status=status.HTTP_200_OK, data={'results': results})
+
+    @staticmethod
+    def __send_m2m_changed(user, through, action, recipe_ids):
+        if recipe_ids:
+            m2m_changed.send(
+                sender=through,
+                instance=user,
+                action=action,
+                reverse=True,
+                model=Recipe,
+                pk_set=set(recipe_ids),
+                using=router.db_for_write(through, instance=user),
+            )
+
     def __get_shopping_cart_ingredients(
             self, user: User
     ) -> QuerySet[str, str, int]:
         """
-        Return a dict with ingredients and their total amounts
+        Return ingredients and their total amounts
         from the request user's shopping cart.
 
+        The totals are maintained incrementally as recipes are added
+        to or removed from the cart, so reading them costs the same
+        regardless of the number of recipes in the cart.
+
         """
-        recipes_in_cart = user.shopping_cart
-        ingredients_total_amount = recipes_in_cart.values(
-            'recipeingredientamount__ingredient_unit'
-        ).annotate(
-            total_amount=Sum('recipeingredientamount__amount')
-        ).values_list(
-            'recipeingredientamount__ingredient_unit__ingredient__name',
-            'recipeingredientamount__ingredient_unit__measurement_unit__name',
+        return user.shopping_cart_ingredients.values_list(
+            'ingredient_unit__ingredient__name',
+            'ingredient_unit__measurement_unit__name',
             'total_amount',
+        ).order_by(
+            'ingredient_unit__ingredient__name',
+            'ingredient_unit__measurement_unit__name',
         )
-        return ingredients_total_amount
-
-    @staticmethod
-    def convert_to_readable_data(
-        ingredients_total_amount: QuerySet[str, str, int]
-    ) -> list[str]:
-        """Convert QuerySet data into a list of strings."""
-        readable_data = []
-        for item in ingredients_total_amount:
-            ingredient_name, unit, amount = item
-            readable_data.append(f'{ingredient_name}({unit}): {amount}\n')
-        return sorted(readable_data)
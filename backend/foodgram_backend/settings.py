@@ -22,6 +22,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     'recipes',
     'users',
@@ -82,6 +83,17 @@ DATABASES = {
     }
 }
 
+# The cached representations and their versions are invalidated
+# by every worker process, so the cache must be shared by them.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND', 'django.core.cache.backends.redis.RedisCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'redis://redis:6379/0'),
+    }
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -149,4 +161,18 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 CSV_DATA_PATH = os.path.join(BASE_DIR, 'data')
 
+INGREDIENT_INDEX_PATH = os.getenv(
+    'INGREDIENT_INDEX_PATH',
+    os.path.join(BASE_DIR, 'index', 'ingredients.idx'),
+)
+
+# Limits of the base64 encoded images (recipe images)
+BASE64_IMAGE_MAX_SIZE = 10 * 1024 * 1024
+BASE64_IMAGE_MAX_WIDTH = 5000
+BASE64_IMAGE_MAX_HEIGHT = 5000
+
+# Number of threads rendering the recipe image variants per process,
+# 0 renders them in the request thread after the transaction commits
+IMAGE_VARIANTS_WORKERS = int(os.getenv('IMAGE_VARIANTS_WORKERS', 2))
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
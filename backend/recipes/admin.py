@@ -6,6 +6,7 @@ from recipes.models import (
     MeasurementUnit,
     Recipe,
     RecipeIngredientAmount,
+    ShoppingCartIngredient,
     Tag,
 )
 
@@ -64,6 +65,19 @@ class RecipeAdmin(admin.ModelAdmin):
     list_filter = ('author', 'name', 'tags')
     inlines = (RecipeIngredientAmountInLine,)
 
+    def save_related(self, request, form, formsets, change):
+        """
+        Apply the changes of the recipe ingredients to the shopping
+        cart ingredient totals of the users.
+
+        """
+        recipe = form.instance
+        old_amounts = ShoppingCartIngredient.objects.get_recipe_amounts(
+            [recipe.pk]
+        )
+        super().save_related(request, form, formsets, change)
+        ShoppingCartIngredient.objects.update_recipe(recipe, old_amounts)
+
 
 admin.site.register(MeasurementUnit, MeasurementUnitAdmin)
 admin.site.register(Ingredient, IngredientAdmin)
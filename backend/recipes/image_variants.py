@@ -0,0 +1,190 @@
+"""
+Resized JPEG and WebP variants of the recipe images.
+
+The variants are rendered in a pool of worker threads once
+the transaction saving a recipe with a new image commits, and are
+stored next to the original images. Recipe.image_variants keeps
+the image they were rendered from and their files by variant
+name and format:
+
+    {
+        'source': 'recipes/images/cake.png',
+        'variants': {
+            'card': {
+                'jpeg': 'recipes/variants/cake_card.jpg',
+                'webp': 'recipes/variants/cake_card.webp',
+            },
+            ...
+        },
+    }
+
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connections, transaction
+from django.dispatch import Signal
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from recipes.models import Recipe
+
+IMAGE_VARIANTS = {
+    'card': (400, 400),
+    'detail': (1000, 1000),
+    'retina': (2000, 2000),
+}
+IMAGE_FORMATS = {
+    'jpeg': ('JPEG', 'jpg', {'quality': 80, 'progressive': True}),
+    'webp': ('WEBP', 'webp', {'quality': 80, 'method': 4}),
+}
+VARIANTS_UPLOAD_TO = 'recipes/variants/'
+
+image_variants_rendered = Signal()
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def has_current_variants(recipe: Recipe) -> bool:
+    """Return whether the variants are rendered from the current image."""
+    return recipe.image_variants.get('source') == recipe.image.name
+
+
+def render_image_variants(recipe_id: int, force: bool = False) -> bool:
+    """
+    Render and store the variants of the recipe image, unless
+    they are already rendered from it and rendering is not forced.
+
+    The variants are saved to the recipe only if neither its image
+    nor its variants have been changed meanwhile, along with
+    a new updated_at for the cached representations; the files of
+    the replaced variants are deleted. Return whether the variants
+    are saved.
+
+    """
+    recipe = Recipe.objects.only('id', 'image', 'image_variants').filter(
+        pk=recipe_id,
+    ).first()
+    if recipe is None or not recipe.image:
+        return False
+    if has_current_variants(recipe) and not force:
+        return False
+
+    storage = recipe.image.storage
+    source = recipe.image.name
+    stem = os.path.splitext(os.path.basename(source))[0]
+    variants = {}
+    with recipe.image.open('rb') as file, Image.open(file) as image:
+        image = flatten(ImageOps.exif_transpose(image))
+        for variant, size in sorted(
+            IMAGE_VARIANTS.items(), key=lambda item: item[1], reverse=True,
+        ):
+            image.thumbnail(size)
+            for format, (pil_format, extension, options) in (
+                IMAGE_FORMATS.items()
+            ):
+                content = BytesIO()
+                image.save(content, pil_format, **options)
+                variants.setdefault(variant, {})[format] = storage.save(
+                    f'{VARIANTS_UPLOAD_TO}{stem}_{variant}.{extension}',
+                    ContentFile(content.getvalue()),
+                )
+
+    saved = Recipe.objects.filter(
+        pk=recipe_id,
+        image=source,
+        image_variants=recipe.image_variants,
+    ).update(
+        image_variants={'source': source, 'variants': variants},
+        updated_at=timezone.now(),
+    )
+    replaced_variants = (
+        recipe.image_variants.get('variants', {}) if saved else variants
+    )
+    for files in replaced_variants.values():
+        for name in files.values():
+            storage.delete(name)
+    if saved:
+        image_variants_rendered.send(sender=Recipe, recipe_id=recipe_id)
+    return bool(saved)
+
+
+def flatten(image: Image.Image) -> Image.Image:
+    """Return the image in RGB, with transparency over white."""
+    if image.mode in ('RGBA', 'LA') or 'transparency' in image.info:
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def _render_logging_errors(recipe_id: int, force: bool = False) -> bool:
+    try:
+        return render_image_variants(recipe_id, force)
+    except Exception:
+        logger.exception(
+            'Failed to render the image variants of recipe %s.', recipe_id,
+        )
+        return False
+
+
+def _render_in_worker(recipe_id: int, force: bool = False) -> bool:
+    try:
+        return _render_logging_errors(recipe_id, force)
+    finally:
+        connections.close_all()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the worker pool shared by the process."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.IMAGE_VARIANTS_WORKERS,
+                thread_name_prefix='image-variants',
+            )
+    return _executor
+
+
+def schedule_image_variants(recipe_id: int) -> None:
+    """
+    Render the variants of the recipe image in the worker pool
+    (or right away if IMAGE_VARIANTS_WORKERS is 0) once
+    the current transaction commits.
+
+    """
+    if settings.IMAGE_VARIANTS_WORKERS:
+        transaction.on_commit(
+            lambda: get_executor().submit(_render_in_worker, recipe_id)
+        )
+    else:
+        transaction.on_commit(lambda: _render_logging_errors(recipe_id))
+
+
+def render_all_image_variants(recipe_ids, workers: int,
+                              force: bool = False) -> int:
+    """
+    Render the variants of the given recipes' images with
+    the given number of worker threads (in the current thread
+    if it is 1). Return the number of the recipes with saved variants.
+
+    """
+    render = partial(
+        _render_logging_errors if workers <= 1 else _render_in_worker,
+        force=force,
+    )
+    if workers <= 1:
+        return sum(map(render, recipe_ids))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return sum(executor.map(render, recipe_ids))
@@ -0,0 +1,273 @@
+"""
+Memory-mapped prefix index of the ingredient catalog.
+
+The index is a read-only file built from the IngredientUnit,
+Ingredient and MeasurementUnit tables. Every worker process maps it
+into memory, so all of them share the same page cache pages and
+ingredient search needs no database round trip.
+
+File layout (native byte order, unsigned 32-bit integers):
+
+    header          magic, format version, entry count, keys size
+    key offsets     count + 1 offsets of the keys in the keys section
+    record offsets  count + 1 offsets of the records in the records section
+    keys            ingredient search names, NUL-terminated
+    records         id, name length, unit length, name, unit (UTF-8)
+
+Entries are sorted by (search name, measurement unit, id), so
+the entries starting with a prefix form a contiguous range found
+with a binary search.
+
+"""
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import transaction
+
+from recipes.models import IngredientUnit, normalize_search_name
+
+MAGIC = b'FGII'
+FORMAT_VERSION = 2
+HEADER = struct.Struct('=4sIII')
+RECORD_HEADER = struct.Struct('=IHH')
+KEY_TERMINATOR = b'\x00'
+
+_state = threading.local()
+
+
+def build_ingredient_index(path=None) -> int:
+    """
+    Build the index file from the catalog tables and atomically
+    replace the existing one. Return the number of entries.
+
+    """
+    path = path or settings.INGREDIENT_INDEX_PATH
+    entries = sorted(
+        (key, unit, pk, name)
+        for pk, key, name, unit in IngredientUnit.objects.values_list(
+            'id',
+            'ingredient__search_name',
+            'ingredient__name',
+            'measurement_unit__name',
+        )
+    )
+
+    key_offsets, record_offsets = array('I'), array('I')
+    keys, records = bytearray(), bytearray()
+    for key, unit, pk, name in entries:
+        key_offsets.append(len(keys))
+        keys += key.encode('utf-8') + KEY_TERMINATOR
+        name, unit = name.encode('utf-8'), unit.encode('utf-8')
+        record_offsets.append(len(records))
+        records += RECORD_HEADER.pack(pk, len(name), len(unit)) + name + unit
+    key_offsets.append(len(keys))
+    record_offsets.append(len(records))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=directory, delete=False) as file:
+        try:
+            file.write(HEADER.pack(
+                MAGIC, FORMAT_VERSION, len(entries), len(keys),
+            ))
+            file.write(key_offsets.tobytes())
+            file.write(record_offsets.tobytes())
+            file.write(keys)
+            file.write(records)
+            file.flush()
+            os.fsync(file.fileno())
+            os.chmod(file.name, 0o644)
+            os.replace(file.name, path)
+        except BaseException:
+            os.unlink(file.name)
+            raise
+    return len(entries)
+
+
+def _rebuild_scheduled_index():
+    build_ingredient_index()
+
+
+def schedule_ingredient_index_rebuild() -> None:
+    """
+    Rebuild the index once the current transaction commits.
+
+    Several catalog changes made in one transaction, or inside
+    deferred_ingredient_index_rebuild(), cause a single rebuild.
+    A rebuild is scheduled again unless it is already waiting
+    among the commit callbacks of the transaction, which are
+    dropped if the transaction is rolled back.
+
+    """
+    if getattr(_state, 'deferred', False):
+        _state.rebuild_deferred = True
+        return
+    connection = transaction.get_connection()
+    if not any(
+        callback[1] is _rebuild_scheduled_index
+        for callback in connection.run_on_commit
+    ):
+        transaction.on_commit(_rebuild_scheduled_index)
+
+
+@contextmanager
+def deferred_ingredient_index_rebuild():
+    """
+    Postpone the index rebuilds caused by catalog changes
+    (e.g. a bulk data load) until the end of the block.
+
+    """
+    _state.deferred, _state.rebuild_deferred = True, False
+    try:
+        yield
+    finally:
+        _state.deferred = False
+        if _state.rebuild_deferred:
+            schedule_ingredient_index_rebuild()
+
+
+class _IndexFile:
+    """A mapped index file with its sections, never changed once built."""
+
+    def __init__(self, index_mmap, file_id):
+        magic, version, count, keys_size = HEADER.unpack_from(index_mmap)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError('Unsupported ingredient index file.')
+        view = memoryview(index_mmap)
+        offsets_size = (count + 1) * array('I').itemsize
+        key_offsets_start = HEADER.size
+        record_offsets_start = key_offsets_start + offsets_size
+        self.keys_start = record_offsets_start + offsets_size
+        self.records_start = self.keys_start + keys_size
+        self.key_offsets = view[
+            key_offsets_start:record_offsets_start
+        ].cast('I')
+        self.record_offsets = view[
+            record_offsets_start:self.keys_start
+        ].cast('I')
+        self.count = count
+        self.mmap = index_mmap
+        self.file_id = file_id
+
+    def key(self, position: int) -> bytes:
+        start = self.keys_start + self.key_offsets[position]
+        end = self.keys_start + self.key_offsets[position + 1] - 1
+        return self.mmap[start:end]
+
+    def record(self, position: int) -> dict:
+        start = self.records_start + self.record_offsets[position]
+        pk, name_size, unit_size = RECORD_HEADER.unpack_from(
+            self.mmap, start,
+        )
+        start += RECORD_HEADER.size
+        name = self.mmap[start:start + name_size]
+        unit = self.mmap[start + name_size:start + name_size + unit_size]
+        return {
+            'id': pk,
+            'name': name.decode('utf-8'),
+            'measurement_unit': unit.decode('utf-8'),
+        }
+
+
+class IngredientIndex:
+    """
+    Read-only view of the index file.
+
+    The file is mapped lazily and mapped again when it is replaced
+    by a rebuild, which is detected by its inode and modification time.
+    A new mapping is swapped in with a single assignment, so
+    concurrent searches keep using the mapping they started with,
+    which is unmapped once the last of them is done.
+
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+
+    def _refresh(self) -> _IndexFile | None:
+        """Return the mapping of the current index file, if valid."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self._file = None
+            return None
+        file_id = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        index_file = self._file
+        if index_file is not None and index_file.file_id == file_id:
+            return index_file
+        if stat.st_size < HEADER.size:
+            return None
+
+        with self._lock:
+            index_file = self._file
+            if index_file is not None and index_file.file_id == file_id:
+                return index_file
+            with open(self.path, 'rb') as file:
+                index_mmap = mmap.mmap(
+                    file.fileno(), 0, access=mmap.ACCESS_READ,
+                )
+            try:
+                index_file = _IndexFile(index_mmap, file_id)
+            except ValueError:
+                index_mmap.close()
+                return None
+            self._file = index_file
+        return index_file
+
+    def search(self, value: str, limit: int = None):
+        """
+        Return the entries whose names contain the given value:
+        the ones starting with it first, then the rest, each ordered
+        by name and measurement unit.
+
+        Return None if the index file is missing or invalid.
+
+        """
+        index_file = self._refresh()
+        if index_file is None:
+            return None
+        needle = normalize_search_name(value).encode('utf-8')
+        if not needle or KEY_TERMINATOR in needle:
+            return None
+        count = index_file.count
+        limit = count if limit is None else limit
+
+        first = bisect_left(range(count), needle, key=index_file.key)
+        last = first
+        while last < count and index_file.key(last).startswith(needle):
+            last += 1
+        positions = list(range(first, min(last, first + limit)))
+
+        keys_start = index_file.keys_start
+        keys_end = index_file.records_start
+        key_offsets = index_file.key_offsets
+        found = index_file.mmap.find(needle, keys_start, keys_end)
+        while found != -1 and len(positions) < limit:
+            position = bisect_right(key_offsets, found - keys_start) - 1
+            if not first <= position < last:
+                positions.append(position)
+            found = index_file.mmap.find(
+                needle, keys_start + key_offsets[position + 1], keys_end,
+            )
+        return [index_file.record(position) for position in positions]
+
+
+_index = None
+
+
+def get_ingredient_index() -> IngredientIndex:
+    """Return the index of the file set in INGREDIENT_INDEX_PATH."""
+    global _index
+    path = settings.INGREDIENT_INDEX_PATH
+    if _index is None or _index.path != path:
+        _index = IngredientIndex(path)
+    return _index
@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from recipes.image_variants import (
+    has_current_variants,
+    render_all_image_variants,
+)
+from recipes.models import Recipe
+
+
+class Command(BaseCommand):
+    help = ('Renders the missing or outdated variants '
+            'of the existing recipe images.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Render the variants of all the recipe images.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=max(settings.IMAGE_VARIANTS_WORKERS, 1),
+            help='Number of the rendering threads.',
+        )
+
+    def handle(self, *args, **options):
+        recipe_ids = [
+            recipe.pk
+            for recipe in Recipe.objects.exclude(image='').only(
+                'id', 'image', 'image_variants',
+            ).iterator()
+            if options['all'] or not has_current_variants(recipe)
+        ]
+        count = render_all_image_variants(
+            recipe_ids, options['workers'], force=options['all'],
+        )
+        self.stdout.write(
+            f'Image variants of {count} recipes out of '
+            f'{len(recipe_ids)} are rendered.'
+        )
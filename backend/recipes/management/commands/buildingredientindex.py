@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from recipes.ingredient_index import build_ingredient_index
+
+
+class Command(BaseCommand):
+    help = 'Builds the memory-mapped ingredient search index file.'
+
+    def handle(self, *args, **options):
+        count = build_ingredient_index()
+        self.stdout.write(
+            f'Ingredient index with {count} entries '
+            f'is written to {settings.INGREDIENT_INDEX_PATH}.'
+        )
@@ -7,6 +7,8 @@ from django.conf import settings
 from django.core.management import BaseCommand, call_command
 from django.db import connection
 
+from recipes.ingredient_index import deferred_ingredient_index_rebuild
+
 MODEL_FILE = {
     'apps': {
         'users': {'User': 'user.csv'},
@@ -44,12 +46,13 @@ class Command(BaseCommand):
             self.stdout.write(f'{model} loading  is complete', ending='\n\n')
 
     def handle(self, *args, **options):
-        for app_name, data in MODEL_FILE['apps'].items():
-            for model_name, csv_file in data.items():
-                model = apps.get_model(app_name, model_name)
-                file_path = os.path.join(CSV_DATA_PATH, csv_file)
-                self._load_csv(file_path, model)
-            self.stdout.write('The db prepopulation is complete.')
+        with deferred_ingredient_index_rebuild():
+            for app_name, data in MODEL_FILE['apps'].items():
+                for model_name, csv_file in data.items():
+                    model = apps.get_model(app_name, model_name)
+                    file_path = os.path.join(CSV_DATA_PATH, csv_file)
+                    self._load_csv(file_path, model)
+                self.stdout.write('The db prepopulation is complete.')
 
         commands = StringIO()
         for app in apps.get_app_configs():
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.4 on 2026-10-17 07:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0005_alter_tag_name'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(
+                fields=['-pub_date', 'name', 'id'],
+                name='recipe_pub_date_name_id_idx',
+            ),
+        ),
+    ]
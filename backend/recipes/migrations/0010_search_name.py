@@ -0,0 +1,63 @@
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+SEARCH_NAME_MODELS = ('ingredient', 'measurementunit', 'recipe', 'tag')
+
+
+def normalize_search_name(value):
+    return ' '.join(value.lower().replace('ё', 'е').split())
+
+
+def fill_search_names(apps, schema_editor):
+    for model_name in SEARCH_NAME_MODELS:
+        model = apps.get_model('recipes', model_name)
+        objs = list(model.objects.only('id', 'name'))
+        for obj in objs:
+            obj.search_name = normalize_search_name(obj.name)
+        model.objects.bulk_update(objs, ('search_name',), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0009_ingredient_name_trgm_idx'),
+    ]
+
+    operations = [
+        *(
+            migrations.AddField(
+                model_name=model_name,
+                name='search_name',
+                field=models.CharField(
+                    db_index=True,
+                    default='',
+                    editable=False,
+                    max_length=200,
+                    verbose_name='Ключ поиска',
+                ),
+                preserve_default=False,
+            )
+            for model_name in SEARCH_NAME_MODELS
+        ),
+        migrations.RunPython(fill_search_names, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='ingredient',
+            name='ingredient_name_trgm_idx',
+        ),
+        migrations.AddIndex(
+            model_name='ingredient',
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=['search_name'],
+                name='ingredient_search_trgm_idx',
+                opclasses=['gin_trgm_ops'],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=['search_name'],
+                name='recipe_search_trgm_idx',
+                opclasses=['gin_trgm_ops'],
+            ),
+        ),
+    ]
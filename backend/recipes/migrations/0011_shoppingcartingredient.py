@@ -0,0 +1,99 @@
+# Generated by Django 4.2.4 on 2026-10-17 07:48
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_shopping_cart_ingredients(apps, schema_editor):
+    Recipe = apps.get_model('recipes', 'Recipe')
+    ShoppingCartIngredient = apps.get_model(
+        'recipes', 'ShoppingCartIngredient'
+    )
+    totals = (
+        Recipe.shopping_cart_adds.through.objects.values(
+            'user', 'recipe__recipeingredientamount__ingredient_unit'
+        )
+        .annotate(
+            total_amount=models.Sum('recipe__recipeingredientamount__amount')
+        )
+        .filter(total_amount__isnull=False)
+        .values_list(
+            'user',
+            'recipe__recipeingredientamount__ingredient_unit',
+            'total_amount',
+        )
+    )
+    ShoppingCartIngredient.objects.bulk_create(
+        (
+            ShoppingCartIngredient(
+                user_id=user_id,
+                ingredient_unit_id=ingredient_unit_id,
+                total_amount=total_amount,
+            )
+            for user_id, ingredient_unit_id, total_amount in totals.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('recipes', '0010_search_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShoppingCartIngredient',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                (
+                    'total_amount',
+                    models.IntegerField(
+                        default=0, verbose_name='Общее количество'
+                    ),
+                ),
+                (
+                    'ingredient_unit',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to='recipes.ingredientunit',
+                        verbose_name='Ингредиент с ед.изм.',
+                    ),
+                ),
+                (
+                    'user',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='shopping_cart_ingredients',
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name='Пользователь',
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'Ингредиент из корзины',
+                'verbose_name_plural': 'Ингредиенты из корзины',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='shoppingcartingredient',
+            constraint=models.UniqueConstraint(
+                fields=('user', 'ingredient_unit'),
+                name='unique_shopping_cart_ingredient',
+            ),
+        ),
+        migrations.RunPython(
+            fill_shopping_cart_ingredients, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,150 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def user_recipe_model(name, db_table, verbose_name, verbose_name_plural):
+    """
+    Return the state operation creating an explicit through model
+    for the existing auto-created many-to-many table.
+
+    """
+    return migrations.CreateModel(
+        name=name,
+        fields=[
+            (
+                'id',
+                models.BigAutoField(
+                    auto_created=True,
+                    primary_key=True,
+                    serialize=False,
+                    verbose_name='ID',
+                ),
+            ),
+            (
+                'recipe',
+                models.ForeignKey(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    to='recipes.recipe',
+                    verbose_name='Рецепт',
+                ),
+            ),
+            (
+                'user',
+                models.ForeignKey(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    to=settings.AUTH_USER_MODEL,
+                    verbose_name='Пользователь',
+                ),
+            ),
+        ],
+        options={
+            'verbose_name': verbose_name,
+            'verbose_name_plural': verbose_name_plural,
+            'db_table': db_table,
+            'ordering': ('-created_at', '-id'),
+            'abstract': False,
+            'unique_together': {('recipe', 'user')},
+        },
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('recipes', '0011_shoppingcartingredient'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                user_recipe_model(
+                    'Favorite',
+                    'recipes_recipe_adds_to_favorites',
+                    'Избранный рецепт',
+                    'Избранные рецепты',
+                ),
+                user_recipe_model(
+                    'ShoppingCartItem',
+                    'recipes_recipe_shopping_cart_adds',
+                    'Рецепт в корзине',
+                    'Рецепты в корзине',
+                ),
+                migrations.AlterField(
+                    model_name='recipe',
+                    name='adds_to_favorites',
+                    field=models.ManyToManyField(
+                        blank=True,
+                        related_name='favorites',
+                        through='recipes.Favorite',
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name='Избранное',
+                    ),
+                ),
+                migrations.AlterField(
+                    model_name='recipe',
+                    name='shopping_cart_adds',
+                    field=models.ManyToManyField(
+                        blank=True,
+                        related_name='shopping_cart',
+                        through='recipes.ShoppingCartItem',
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name='В корзине',
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name='favorite',
+            name='created_at',
+            field=models.DateTimeField(
+                default=django.utils.timezone.now,
+                verbose_name='Дата добавления',
+            ),
+        ),
+        migrations.AddField(
+            model_name='shoppingcartitem',
+            name='created_at',
+            field=models.DateTimeField(
+                default=django.utils.timezone.now,
+                verbose_name='Дата добавления',
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name='favorite',
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name='shoppingcartitem',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='favorite',
+            constraint=models.UniqueConstraint(
+                fields=('user', 'recipe'), name='unique_favorite_user_recipe'
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name='shoppingcartitem',
+            constraint=models.UniqueConstraint(
+                fields=('user', 'recipe'),
+                name='unique_shopping_cart_user_recipe',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='favorite',
+            index=models.Index(
+                fields=['user', '-created_at', '-id'],
+                name='favorite_user_created_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='shoppingcartitem',
+            index=models.Index(
+                fields=['user', '-created_at', '-id'],
+                name='shopping_cart_user_created_idx',
+            ),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from colorfield.fields import ColorField
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import GinIndex
 from django.core.exceptions import ValidationError
 from django.core.validators import (
     MaxValueValidator,
@@ -7,12 +8,57 @@ from django.core.validators import (
     RegexValidator,
 )
 from django.db import models
+from django.db.models.functions import RowNumber
+from django.utils import timezone
 from pytils.translit import slugify
 
 User = get_user_model()
 
 
-class NameBaseModel(models.Model):
+def normalize_search_name(value: str) -> str:
+    """
+    Return the search key of a name: lowercase, with 'ё' replaced
+    by 'е' and whitespace runs collapsed into single spaces.
+
+    """
+    return ' '.join(value.lower().replace('ё', 'е').split())
+
+
+class SearchNameModel(models.Model):
+    """
+    Abstract model keeping the normalized search key of the name field.
+
+    Name searches compare the normalized search value with the key
+    as is, so that they can use the index on the key column.
+
+    """
+    search_name = models.CharField(
+        'Ключ поиска',
+        max_length=200,
+        db_index=True,
+        editable=False,
+    )
+
+    class Meta:
+        abstract = True
+
+    def set_search_name(self):
+        self.search_name = normalize_search_name(self.name)
+
+    def clean_fields(self, exclude=None):
+        """Skip the search key, which is only set on save()."""
+        exclude = {*(exclude or ()), 'search_name'}
+        super().clean_fields(exclude=exclude)
+
+    def save(self, *args, **kwargs):
+        self.set_search_name()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'search_name'}
+        super().save(*args, **kwargs)
+
+
+class NameBaseModel(SearchNameModel):
     """Abstract model for classes with name field.."""
     LETTER_CASES = {
         'capitalize': str.capitalize,
@@ -30,7 +76,7 @@ class NameBaseModel(models.Model):
         db_index=True,
     )
 
-    class Meta:
+    class Meta(SearchNameModel.Meta):
         abstract = True
         ordering = ('name',)
 
@@ -89,6 +135,13 @@ class Ingredient(NameBaseModel):
     class Meta(NameBaseModel.Meta):
         verbose_name = 'Ингредиент'
         verbose_name_plural = 'Ингредиенты'
+        indexes = [
+            GinIndex(
+                fields=('search_name',),
+                opclasses=['gin_trgm_ops'],
+                name='ingredient_search_trgm_idx',
+            ),
+        ]
 
 
 class IngredientUnit(models.Model):
@@ -185,7 +238,7 @@ class Tag(NameBaseModel):
         super().save(*args, **kwargs)
 
 
-class Recipe(models.Model):
+class Recipe(SearchNameModel):
     """Model for food recipes."""
     name = models.CharField(
         'Название',
@@ -227,21 +280,33 @@ class Recipe(models.Model):
         'Избражение рецепта',
         upload_to='recipes/images/',
     )
+    image_variants = models.JSONField(
+        'Варианты изображения',
+        default=dict,
+        blank=True,
+        editable=False,
+    )
     pub_date = models.DateTimeField(
         'Дата публикации',
         auto_now_add=True,
         db_index=True,
     )
+    updated_at = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True,
+    )
     shopping_cart_adds = models.ManyToManyField(
         User,
         verbose_name='В корзине',
         related_name='shopping_cart',
+        through='ShoppingCartItem',
         blank=True,
     )
     adds_to_favorites = models.ManyToManyField(
         User,
         verbose_name='Избранное',
         related_name='favorites',
+        through='Favorite',
         blank=True,
     )
 
@@ -255,6 +320,17 @@ class Recipe(models.Model):
                 name='unique_author_recipe_name',
             )
         ]
+        indexes = [
+            models.Index(
+                fields=('-pub_date', 'name', 'id'),
+                name='recipe_pub_date_name_id_idx',
+            ),
+            GinIndex(
+                fields=('search_name',),
+                opclasses=['gin_trgm_ops'],
+                name='recipe_search_trgm_idx',
+            ),
+        ]
 
     def __str__(self):
         return f'Рецепт "{self.name}"({self.author})'
@@ -283,6 +359,77 @@ class Recipe(models.Model):
                                                        'в избранное')
 
 
+class UserRecipeBaseModel(models.Model):
+    """
+    Abstract model for the recipes added by users
+    to their favorites or shopping carts.
+
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        verbose_name='Пользователь',
+    )
+    recipe = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        verbose_name='Рецепт',
+    )
+    created_at = models.DateTimeField(
+        'Дата добавления',
+        default=timezone.now,
+    )
+
+    class Meta:
+        abstract = True
+        ordering = ('-created_at', '-id')
+
+    def __str__(self):
+        return f'{self.user}: {self.recipe}'
+
+
+class Favorite(UserRecipeBaseModel):
+    """Model for the recipes in users' favorites."""
+
+    class Meta(UserRecipeBaseModel.Meta):
+        db_table = 'recipes_recipe_adds_to_favorites'
+        verbose_name = 'Избранный рецепт'
+        verbose_name_plural = 'Избранные рецепты'
+        constraints = [
+            models.UniqueConstraint(
+                fields=('user', 'recipe'),
+                name='unique_favorite_user_recipe',
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=('user', '-created_at', '-id'),
+                name='favorite_user_created_idx',
+            ),
+        ]
+
+
+class ShoppingCartItem(UserRecipeBaseModel):
+    """Model for the recipes in users' shopping carts."""
+
+    class Meta(UserRecipeBaseModel.Meta):
+        db_table = 'recipes_recipe_shopping_cart_adds'
+        verbose_name = 'Рецепт в корзине'
+        verbose_name_plural = 'Рецепты в корзине'
+        constraints = [
+            models.UniqueConstraint(
+                fields=('user', 'recipe'),
+                name='unique_shopping_cart_user_recipe',
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=('user', '-created_at', '-id'),
+                name='shopping_cart_user_created_idx',
+            ),
+        ]
+
+
 class RecipeIngredientAmount(models.Model):
     """
     Model for many-to-many relationship between
@@ -325,3 +472,274 @@ class RecipeIngredientAmount(models.Model):
 
     def __str__(self):
         return f'{self.recipe}, {self.ingredient_unit}, {self.amount}'
+
+
+class FeedEntryManager(models.Manager):
+    """
+    Manager that keeps the materialized subscription feeds
+    in sync with recipes and subscriptions.
+
+    """
+    BACKFILL_LIMIT = 100
+    BATCH_SIZE = 1000
+
+    def fan_out(self, recipe: Recipe) -> None:
+        """Add the new recipe to the feeds of its author's subscribers."""
+        subscriber_ids = recipe.author.subscribers.values_list(
+            'user', flat=True,
+        )
+        self.bulk_create(
+            (
+                self.model(
+                    subscriber_id=subscriber_id,
+                    author_id=recipe.author_id,
+                    recipe=recipe,
+                )
+                for subscriber_id in subscriber_ids.iterator()
+            ),
+            batch_size=self.BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+
+    def backfill(self, subscriber: User, *authors: User | int) -> None:
+        """
+        Add the authors' latest recipes to the subscriber's feed
+        with one query selecting them and one inserting the entries.
+
+        The entries are dated by the recipes publication dates,
+        so that they take their places in the feed chronology.
+
+        """
+        if not authors:
+            return
+        recipes = Recipe.objects.filter(author__in=authors).alias(
+            author_rank=models.Window(
+                RowNumber(),
+                partition_by='author',
+                order_by=(models.F('pub_date').desc(), models.F('id').desc()),
+            ),
+        ).filter(
+            author_rank__lte=self.BACKFILL_LIMIT,
+        ).only('id', 'author', 'pub_date')
+        self.bulk_create(
+            (
+                self.model(
+                    subscriber=subscriber,
+                    author_id=recipe.author_id,
+                    recipe=recipe,
+                    created_at=recipe.pub_date,
+                )
+                for recipe in recipes
+            ),
+            batch_size=self.BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+
+    def prune(self, subscriber: User, *authors: User | int) -> None:
+        """Remove the authors' recipes from the subscriber's feed."""
+        if authors:
+            self.filter(subscriber=subscriber, author__in=authors).delete()
+
+
+class FeedEntry(models.Model):
+    """
+    Model for the subscription feeds materialized on write:
+    a recipe of a followed author in a subscriber's feed.
+
+    """
+    subscriber = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='feed_entries',
+        verbose_name='Подписчик',
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Автор',
+    )
+    recipe = models.ForeignKey(
+        Recipe,
+        on_delete=models.CASCADE,
+        related_name='feed_entries',
+        verbose_name='Рецепт',
+    )
+    created_at = models.DateTimeField(
+        'Дата добавления в ленту',
+        default=timezone.now,
+    )
+
+    objects = FeedEntryManager()
+
+    class Meta:
+        verbose_name = 'Запись ленты подписок'
+        verbose_name_plural = 'Записи ленты подписок'
+        ordering = ('-created_at', '-id')
+        constraints = [
+            models.UniqueConstraint(
+                fields=('subscriber', 'recipe'),
+                name='unique_feed_subscriber_recipe',
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=('subscriber', '-created_at', '-id'),
+                name='feed_subscriber_created_idx',
+            ),
+            models.Index(
+                fields=('subscriber', 'author'),
+                name='feed_subscriber_author_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.subscriber}: {self.recipe}'
+
+
+class ShoppingCartIngredientManager(models.Manager):
+    """
+    Manager that keeps the shopping cart ingredient totals
+    in sync with the shopping carts and recipe ingredients.
+
+    """
+
+    @staticmethod
+    def get_recipe_amounts(recipe_ids) -> dict[int, int]:
+        """
+        Return a dict with the total amounts of the ingredients
+        of the given recipes by ingredient unit id.
+
+        """
+        return dict(
+            RecipeIngredientAmount.objects.filter(
+                recipe_id__in=recipe_ids,
+            ).values('ingredient_unit').annotate(
+                total_amount=models.Sum('amount'),
+            ).values_list('ingredient_unit', 'total_amount')
+        )
+
+    def add_amounts(self, user_ids, amounts: dict[int, int]) -> None:
+        """
+        Add the amounts (negative ones are subtracted) to the totals
+        of the given ingredient units in the users' shopping carts.
+
+        Missing totals are inserted as zeros and then all totals are
+        incremented in place, one UPDATE per distinct amount, so that
+        concurrent changes of the same cart do not overwrite each other.
+
+        """
+        user_ids = list(user_ids)
+        amounts = {
+            ingredient_unit_id: amount
+            for ingredient_unit_id, amount in amounts.items() if amount
+        }
+        if not user_ids or not amounts:
+            return
+
+        self.bulk_create(
+            (
+                self.model(user_id=user_id, ingredient_unit_id=unit_id)
+                for user_id in user_ids
+                for unit_id, amount in amounts.items() if amount > 0
+            ),
+            ignore_conflicts=True,
+        )
+        ingredient_units_by_amount = {}
+        for ingredient_unit_id, amount in amounts.items():
+            ingredient_units_by_amount.setdefault(amount, []).append(
+                ingredient_unit_id
+            )
+        for amount, ingredient_unit_ids in ingredient_units_by_amount.items():
+            self.filter(
+                user_id__in=user_ids,
+                ingredient_unit_id__in=ingredient_unit_ids,
+            ).update(total_amount=models.F('total_amount') + amount)
+        if min(amounts.values()) < 0:
+            self.filter(user_id__in=user_ids, total_amount__lte=0).delete()
+
+    def add_recipes(self, user_ids, recipe_ids) -> None:
+        """Add the ingredients of the recipes to the users' totals."""
+        self.add_amounts(user_ids, self.get_recipe_amounts(recipe_ids))
+
+    def remove_recipes(self, user_ids, recipe_ids) -> None:
+        """Subtract the ingredients of the recipes from the users' totals."""
+        self.add_amounts(
+            user_ids,
+            {
+                ingredient_unit_id: -amount
+                for ingredient_unit_id, amount
+                in self.get_recipe_amounts(recipe_ids).items()
+            },
+        )
+
+    def update_recipe(self, recipe: Recipe, old_amounts: dict[int, int]):
+        """
+        Apply the change of the recipe ingredients to the totals
+        of the users having the recipe in their shopping carts.
+
+        old_amounts are the recipe amounts before the change,
+        as returned by get_recipe_amounts().
+
+        """
+        new_amounts = self.get_recipe_amounts([recipe.pk])
+        self.change_recipe_amounts(
+            recipe,
+            {
+                ingredient_unit_id: (
+                    new_amounts.get(ingredient_unit_id, 0)
+                    - old_amounts.get(ingredient_unit_id, 0)
+                )
+                for ingredient_unit_id in new_amounts.keys() | old_amounts
+            },
+        )
+
+    def change_recipe_amounts(self, recipe: Recipe, amounts: dict[int, int]):
+        """
+        Add the changes of the recipe ingredient amounts to the totals
+        of the users having the recipe in their shopping carts.
+
+        """
+        if any(amounts.values()):
+            self.add_amounts(
+                recipe.shopping_cart_adds.values_list('id', flat=True),
+                amounts,
+            )
+
+
+class ShoppingCartIngredient(models.Model):
+    """
+    Model for the total amount of an ingredient
+    in the recipes of a user's shopping cart.
+
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='shopping_cart_ingredients',
+        verbose_name='Пользователь',
+    )
+    ingredient_unit = models.ForeignKey(
+        IngredientUnit,
+        on_delete=models.CASCADE,
+        verbose_name='Ингредиент с ед.изм.',
+    )
+    total_amount = models.IntegerField(
+        'Общее количество',
+        default=0,
+    )
+
+    objects = ShoppingCartIngredientManager()
+
+    class Meta:
+        verbose_name = 'Ингредиент из корзины'
+        verbose_name_plural = 'Ингредиенты из корзины'
+        constraints = [
+            models.UniqueConstraint(
+                fields=('user', 'ingredient_unit'),
+                name='unique_shopping_cart_ingredient',
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.user}: {self.ingredient_unit}, {self.total_amount}'
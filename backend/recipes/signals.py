@@ -0,0 +1,84 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+
+from recipes.image_variants import (
+    has_current_variants,
+    schedule_image_variants,
+)
+from recipes.models import Recipe, ShoppingCartIngredient, ShoppingCartItem
+
+User = get_user_model()
+
+
+@receiver(m2m_changed, sender=ShoppingCartItem)
+def update_shopping_cart_ingredients(sender, instance, action, reverse,
+                                     pk_set, **kwargs):
+    """
+    Add the ingredients of the recipes added to shopping carts
+    to the users' totals, and subtract the ones of the recipes
+    that are about to be removed.
+
+    Removals are handled before the rows are deleted, as only
+    the recipes that are actually in the carts are subtracted.
+    The rows are locked, so that concurrent removals of the same
+    recipe wait for each other and it is subtracted only once.
+
+    """
+    if action not in ('post_add', 'pre_remove', 'pre_clear'):
+        return
+
+    if action == 'post_add':
+        changed_ids = pk_set
+    else:
+        cart_items = ShoppingCartItem.objects.filter(
+            **{'user' if reverse else 'recipe': instance},
+        )
+        if action == 'pre_remove':
+            cart_items = cart_items.filter(
+                **{'recipe__in' if reverse else 'user__in': pk_set},
+            )
+        changed_ids = cart_items.select_for_update().values_list(
+            'recipe' if reverse else 'user', flat=True,
+        )
+
+    user_ids, recipe_ids = (
+        ([instance.pk], changed_ids) if reverse
+        else (changed_ids, [instance.pk])
+    )
+    if action == 'post_add':
+        ShoppingCartIngredient.objects.add_recipes(user_ids, recipe_ids)
+    else:
+        ShoppingCartIngredient.objects.remove_recipes(
+            list(user_ids), list(recipe_ids),
+        )
+
+
+@receiver(pre_delete, sender=Recipe)
+def remove_recipe_from_shopping_carts(sender, instance, **kwargs):
+    ShoppingCartIngredient.objects.remove_recipes(
+        instance.shopping_cart_adds.values_list('id', flat=True),
+        [instance.pk],
+    )
+
+
+@receiver(post_save, sender=Recipe)
+def count_author_recipe(sender, instance, created, **kwargs):
+    if created:
+        User.objects.change_counter([instance.author_id], 'recipes_count', 1)
+
+
+@receiver(post_delete, sender=Recipe)
+def uncount_author_recipe(sender, instance, **kwargs):
+    User.objects.change_counter([instance.author_id], 'recipes_count', -1)
+
+
+@receiver(post_save, sender=Recipe)
+def render_recipe_image_variants(sender, instance, **kwargs):
+    if instance.image and not has_current_variants(instance):
+        schedule_image_variants(instance.pk)
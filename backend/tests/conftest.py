@@ -0,0 +1,16 @@
+import pytest
+from django.core.cache import cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Keep cached data from leaking between tests."""
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def ingredient_index_path(settings, tmp_path):
+    """Keep tests away from a locally built ingredient index."""
+    settings.INGREDIENT_INDEX_PATH = str(tmp_path / 'ingredients.idx')
@@ -0,0 +1,92 @@
+from http import HTTPStatus
+
+from rest_framework.test import APIClient, APITestCase
+
+from tests.factories import (RecipeWithIngredientAmountFactory, TagFactory,
+                             UserFactory)
+
+TAGS_LIST_URL = '/api/tags/'
+RECIPES_LIST_URL = '/api/recipes/'
+RECIPE_DETAIL_URL = '/api/recipes/{recipe_pk}/'.format
+
+
+class ConditionalGetTestCase(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = UserFactory()
+        cls.tag = TagFactory()
+        cls.recipe = RecipeWithIngredientAmountFactory(tags=(cls.tag,))
+
+    def setUp(self):
+        self.unauthorised_user = APIClient()
+
+        self.authorised_user = APIClient()
+        self.authorised_user.force_authenticate(__class__.user)
+
+    def test_tags_list_not_modified(self):
+        response = self.unauthorised_user.get(TAGS_LIST_URL)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTrue(response.has_header('ETag'))
+        self.assertTrue(response.has_header('Last-Modified'))
+
+        with self.assertNumQueries(0):
+            response = self.unauthorised_user.get(
+                TAGS_LIST_URL, HTTP_IF_NONE_MATCH=response['ETag'],
+            )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+    def test_tags_list_modified(self):
+        etag = self.unauthorised_user.get(TAGS_LIST_URL)['ETag']
+        TagFactory()
+
+        response = self.unauthorised_user.get(
+            TAGS_LIST_URL, HTTP_IF_NONE_MATCH=etag,
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(len(response.data), 2)
+
+    def test_recipes_list_etag_depends_on_user_favorites(self):
+        etag = self.authorised_user.get(RECIPES_LIST_URL)['ETag']
+        self.assertEqual(
+            self.authorised_user.get(
+                RECIPES_LIST_URL, HTTP_IF_NONE_MATCH=etag,
+            ).status_code,
+            HTTPStatus.NOT_MODIFIED,
+        )
+        anonymous_etag = self.unauthorised_user.get(RECIPES_LIST_URL)['ETag']
+        self.assertNotEqual(etag, anonymous_etag)
+
+        self.authorised_user.post(
+            RECIPE_DETAIL_URL(recipe_pk=__class__.recipe.pk) + 'favorite/'
+        )
+        response = self.authorised_user.get(
+            RECIPES_LIST_URL, HTTP_IF_NONE_MATCH=etag,
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTrue(response.data['results'][0]['is_favorited'])
+
+    def test_recipe_detail_if_modified_since(self):
+        url = RECIPE_DETAIL_URL(recipe_pk=__class__.recipe.pk)
+        last_modified = self.unauthorised_user.get(url)['Last-Modified']
+
+        response = self.unauthorised_user.get(
+            url, HTTP_IF_MODIFIED_SINCE=last_modified,
+        )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+    def test_recipe_detail_modified_after_tag_rename(self):
+        url = RECIPE_DETAIL_URL(recipe_pk=__class__.recipe.pk)
+        etag = self.unauthorised_user.get(url)['ETag']
+        __class__.tag.name = 'Переименованный'
+        __class__.tag.save()
+
+        response = self.unauthorised_user.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.data['tags'][0]['name'], 'Переименованный')
+
+    def test_recipe_detail_not_found(self):
+        response = self.unauthorised_user.get(
+            RECIPE_DETAIL_URL(recipe_pk=0)
+        )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
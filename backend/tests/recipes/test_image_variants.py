@@ -0,0 +1,114 @@
+from http import HTTPStatus
+from io import BytesIO, StringIO
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from PIL import Image
+from rest_framework.test import APIClient, APITestCase
+
+from recipes.image_variants import IMAGE_VARIANTS, render_image_variants
+from recipes.models import Recipe
+from tests.factories import RecipeFactory, UserFactory
+
+RECIPE_DETAIL_URL = '/api/recipes/{recipe_pk}/'.format
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+def image_file(size, mode='RGBA', name='image.png'):
+    content = BytesIO()
+    Image.new(mode, size).save(content, format='PNG')
+    return SimpleUploadedFile(name, content.getvalue(), 'image/png')
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class ImageVariantsTestCase(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = UserFactory()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.authorised_user = APIClient()
+        self.authorised_user.force_authenticate(__class__.user)
+
+    def test_render_image_variants(self):
+        recipe = RecipeFactory(image=image_file((1200, 600)))
+
+        self.assertTrue(render_image_variants(recipe.pk))
+        self.assertFalse(render_image_variants(recipe.pk))
+
+        recipe.refresh_from_db()
+        self.assertEqual(recipe.image_variants['source'], recipe.image.name)
+        variants = recipe.image_variants['variants']
+        self.assertEqual(set(variants), set(IMAGE_VARIANTS))
+        for variant, (max_width, max_height) in IMAGE_VARIANTS.items():
+            self.assertEqual(set(variants[variant]), {'jpeg', 'webp'})
+            for name in variants[variant].values():
+                with default_storage.open(name) as file:
+                    with Image.open(file) as image:
+                        self.assertLessEqual(image.width, max_width)
+                        self.assertLessEqual(image.height, max_height)
+                        self.assertEqual(
+                            image.width // image.height, 2,
+                        )
+
+        response = self.authorised_user.get(
+            RECIPE_DETAIL_URL(recipe_pk=recipe.pk)
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        card_url = response.data['image_variants']['card']['webp']
+        self.assertTrue(card_url.startswith('http'))
+        self.assertTrue(card_url.endswith(variants['card']['webp']))
+
+    def test_recipe_detail_etag_changes_with_image_variants(self):
+        recipe = RecipeFactory(image=image_file((100, 100)))
+        url = RECIPE_DETAIL_URL(recipe_pk=recipe.pk)
+        etag = self.authorised_user.get(url)['ETag']
+
+        self.assertTrue(render_image_variants(recipe.pk))
+
+        response = self.authorised_user.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertIn('card', response.data['image_variants'])
+
+    def test_replaced_image_variants_are_deleted(self):
+        recipe = RecipeFactory(image=image_file((100, 100)))
+        render_image_variants(recipe.pk)
+        recipe.refresh_from_db()
+        old_names = [
+            name
+            for files in recipe.image_variants['variants'].values()
+            for name in files.values()
+        ]
+
+        recipe.image = image_file((200, 100), mode='RGB')
+        recipe.save()
+        self.assertTrue(render_image_variants(recipe.pk))
+
+        for name in old_names:
+            self.assertFalse(default_storage.exists(name))
+
+    def test_build_image_variants_command(self):
+        recipes = [
+            RecipeFactory(image=image_file((100, 100))) for _ in range(2)
+        ]
+        render_image_variants(recipes[0].pk)
+
+        call_command('buildimagevariants', workers=1, stdout=StringIO())
+
+        for recipe in Recipe.objects.filter(
+            pk__in=[recipe.pk for recipe in recipes],
+        ):
+            self.assertEqual(
+                recipe.image_variants['source'], recipe.image.name,
+            )
@@ -53,6 +53,17 @@ class IngredientDetailTestCase(APITestCase):
             ingredient_fields, expected_fields
         )
 
+    def test_ingredient_detail_ignores_limit(self):
+        ingredient = IngredientUnitFactory.create_batch(3)[-1]
+        response = self.authorised_user.get(
+            f'/api/ingredients/{ingredient.pk}/', data={'limit': 1},
+        )
+
+        self.assertEqual(
+            response.status_code, HTTPStatus.OK
+        )
+        self.assertEqual(response.data['id'], ingredient.pk)
+
     def test_ingredient_detail_404(self):
         ingredient = IngredientUnitFactory()
         IngredientUnit.objects.filter(pk=ingredient.pk).delete()
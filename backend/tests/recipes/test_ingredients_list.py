@@ -1,7 +1,12 @@
 from http import HTTPStatus
 
+from django.db import DatabaseError, transaction
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIClient, APITestCase
 
+from recipes.ingredient_index import (build_ingredient_index,
+                                      get_ingredient_index,
+                                      schedule_ingredient_index_rebuild)
 from recipes.models import IngredientUnit
 from tests.factories import (IngredientUnitFactory, UserFactory,
                              IngredientFactory)
@@ -90,3 +95,140 @@ class IngredientsListTestCase(APITestCase):
                     response.status_code, HTTPStatus.OK
                 )
                 self.assertEqual(response.data, expected_result)
+
+    def test_ingredients_filter_by_name_prefix_matches_first(self):
+        for name in ('sea salt', 'salt', 'saltwort', 'rice'):
+            IngredientUnitFactory(ingredient=IngredientFactory(name=name))
+
+        response = self.authorised_user.get(
+            __class__.url, data={'name': 'SALT'},
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(
+            [ingredient['name'] for ingredient in response.data],
+            ['Salt', 'Saltwort', 'Sea salt'],
+        )
+
+        response = self.authorised_user.get(
+            __class__.url, data={'name': 'SALT', 'limit': 2},
+        )
+        self.assertEqual(
+            [ingredient['name'] for ingredient in response.data],
+            ['Salt', 'Saltwort'],
+        )
+
+    def test_ingredients_search_cursor_pagination_prefix_matches_first(self):
+        for name in ('rock salt', 'salt', 'saltwort', 'rice'):
+            IngredientUnitFactory(ingredient=IngredientFactory(name=name))
+
+        names = []
+        url, data = __class__.url, {'name': 'SALT', 'cursor': '', 'limit': 1}
+        while url:
+            response = self.authorised_user.get(url, data=data)
+            self.assertEqual(response.status_code, HTTPStatus.OK)
+            self.assertEqual(
+                set(response.data['results'][0]), {'id', 'name',
+                                                   'measurement_unit'},
+            )
+            names.extend(
+                ingredient['name'] for ingredient in response.data['results']
+            )
+            url, data = response.data['next'], None
+        self.assertEqual(names, ['Salt', 'Saltwort', 'Rock salt'])
+
+    def test_ingredients_search_served_from_index(self):
+        for name in ('sea salt', 'salt', 'saltwort', 'rice'):
+            IngredientUnitFactory(ingredient=IngredientFactory(name=name))
+        params = [
+            {'name': 'SALT'},
+            {'name': 'salt', 'limit': 2},
+            {'name': 'alt'},
+            {'name': 'rice'},
+            {'name': 'missing'},
+        ]
+        expected_results = {
+            str(data): self.authorised_user.get(__class__.url, data=data).data
+            for data in params
+        }
+
+        build_ingredient_index()
+        for data in params:
+            with self.subTest(data=data):
+                with self.assertNumQueries(0):
+                    response = self.authorised_user.get(
+                        __class__.url, data=data,
+                    )
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertEqual(response.json(), expected_results[str(data)])
+
+    def test_ingredients_cursor_pagination(self):
+        expected_response = IngredientUnitSerializer(
+            __class__.ingredients, many=True
+        ).data
+        results = []
+        url, data = __class__.url, {'cursor': '', 'limit': 2}
+        while url:
+            with self.assertNumQueries(1):
+                response = self.authorised_user.get(url, data=data)
+            self.assertEqual(response.status_code, HTTPStatus.OK)
+            self.assertLessEqual(len(response.data['results']), 2)
+            results.extend(response.data['results'])
+            url, data = response.data['next'], None
+        self.assertEqual(results, expected_response)
+
+    def test_ingredients_list_matches_model_serializer_output(self):
+        with self.assertNumQueries(1):
+            response = self.unauthorised_user.get(__class__.url)
+
+        expected_content = JSONRenderer().render(
+            IngredientUnitSerializer(__class__.ingredients, many=True).data
+        )
+        self.assertEqual(response.content, expected_content)
+
+    def test_ingredients_filter_by_normalized_name(self):
+        IngredientUnitFactory(ingredient=IngredientFactory(name='Свёкла'))
+        params = [
+            {'name': 'свекла'},
+            {'name': 'СВЁК'},
+            {'name': '  свёкла '},
+        ]
+        for data in params:
+            with self.subTest(data=data):
+                response = self.authorised_user.get(__class__.url, data=data)
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertEqual(
+                    [ingredient['name'] for ingredient in response.data],
+                    ['Свёкла'],
+                )
+
+
+class IngredientIndexRebuildTestCase(APITestCase):
+    def test_ingredients_index_rebuild_scheduled_after_rollback(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            try:
+                with transaction.atomic():
+                    schedule_ingredient_index_rebuild()
+                    raise DatabaseError
+            except DatabaseError:
+                pass
+            schedule_ingredient_index_rebuild()
+            schedule_ingredient_index_rebuild()
+
+        self.assertEqual(len(callbacks), 1)
+
+    def test_ingredients_index_search_keeps_replaced_mapping(self):
+        IngredientUnitFactory(ingredient=IngredientFactory(name='salt'))
+        build_ingredient_index()
+        index = get_ingredient_index()
+        replaced_file = index._refresh()
+
+        IngredientUnitFactory(ingredient=IngredientFactory(name='sage'))
+        build_ingredient_index()
+
+        self.assertEqual(
+            [ingredient['name'] for ingredient in index.search('sa')],
+            ['Sage', 'Salt'],
+        )
+        self.assertIsNot(index._refresh(), replaced_file)
+        self.assertEqual(replaced_file.count, 1)
+        self.assertEqual(replaced_file.record(0)['name'], 'Salt')
@@ -1,20 +1,29 @@
+import base64
 from http import HTTPStatus
+from io import BytesIO
 import shutil
 import tempfile
+from unittest import mock
 
 from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from rest_framework.test import (APIClient, APITestCase,
                                  APIRequestFactory,
                                  force_authenticate)
 from django.test import override_settings
+from PIL import Image
 
+from api.serializers import Base64ImageField
 from api.views import RecipeViewset
 from recipes.models import Recipe
 from tests.factories import (UserFactory, TagFactory,
                              IngredientUnitFactory,
                              IngredientFactory,
-                             MeasurementUnitFactory
+                             MeasurementUnitFactory,
+                             RecipeFactory,
+                             RecipeIngredientAmountFactory,
                              )
 
 RECIPE_CREATE_URL = '/api/recipes/'
@@ -166,3 +175,211 @@ class RecipeCreateTestCase(APITestCase):
                     response.data[missing_field][0].code,
                     'required',
                 )
+
+    def test_recipe_create_query_count_does_not_grow(self):
+        query_counts = []
+        for size in (1, 20):
+            ingredient_units = IngredientUnitFactory.create_batch(size=size)
+            data = {
+                "ingredients": [
+                    {"id": ingredient_unit.pk, "amount": 10}
+                    for ingredient_unit in ingredient_units
+                ],
+                "tags": [
+                    self.tag.pk,
+                ],
+                "image": ("data:image/png;base64,iVBORw0KGgoAAAANSUh"
+                          "EUgAAAAEAAAABAgMAAABieywaAAAACVBMVEUAAAD///"
+                          "9fX1/S0ecCAAAACXBIWXMAAA7EAAAOxAGVKw4bAAAAC"
+                          "klEQVQImWNoAAAAggCByxOyYQAAAABJRU5ErkJggg=="),
+                "name": f"Testcreate{size}",
+                "text": "TestCreate",
+                "cooking_time": 1,
+            }
+            with CaptureQueriesContext(connection) as queries:
+                response = self.authorised_user.post(
+                    __class__.url, data=data, format='json',
+                )
+            self.assertEqual(response.status_code, HTTPStatus.CREATED)
+            self.assertEqual(len(response.data['ingredients']), size)
+            query_counts.append(len(queries))
+
+        self.assertEqual(query_counts[0], query_counts[1])
+
+    def test_recipe_create_saves_recipe_once(self):
+        data = {
+            "ingredients": [
+                {"id": self.ingredient_unit.pk, "amount": 10},
+            ],
+            "tags": [
+                self.tag.pk,
+            ],
+            "image": ("data:image/png;base64,iVBORw0KGgoAAAANSUh"
+                      "EUgAAAAEAAAABAgMAAABieywaAAAACVBMVEUAAAD///"
+                      "9fX1/S0ecCAAAACXBIWXMAAA7EAAAOxAGVKw4bAAAAC"
+                      "klEQVQImWNoAAAAggCByxOyYQAAAABJRU5ErkJggg=="),
+            "name": "Testsaveonce",
+            "text": "TestCreate",
+            "cooking_time": 1,
+        }
+        with mock.patch(
+            'recipes.signals.schedule_image_variants',
+        ) as schedule_image_variants:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.authorised_user.post(
+                    __class__.url, data=data, format='json',
+                )
+
+        self.assertEqual(response.status_code, HTTPStatus.CREATED)
+        schedule_image_variants.assert_called_once_with(response.data['id'])
+        self.assertFalse([
+            query for query in queries.captured_queries
+            if query['sql'].startswith('UPDATE "recipes_recipe"')
+        ])
+
+    def test_recipe_update_writes_only_changes(self):
+        recipe = RecipeFactory(author=__class__.user, tags=[self.tag])
+        ingredient_amounts = RecipeIngredientAmountFactory.create_batch(
+            size=3, recipe=recipe, amount=10,
+        )
+        data = {
+            "ingredients": [
+                {"id": ingredient_amount.ingredient_unit_id, "amount": 10}
+                for ingredient_amount in ingredient_amounts
+            ],
+            "tags": [self.tag.pk],
+        }
+        data["ingredients"][0]["amount"] = 20
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.authorised_user.patch(
+                f'{__class__.url}{recipe.pk}/', data=data, format='json',
+            )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(
+            sorted(
+                ingredient['amount']
+                for ingredient in response.data['ingredients']
+            ),
+            [10, 10, 20],
+        )
+        writes = [
+            query['sql'].split(' ', 3)[:3]
+            for query in queries.captured_queries
+            if query['sql'].startswith(('INSERT', 'UPDATE', 'DELETE'))
+        ]
+        self.assertEqual(writes, [
+            ['UPDATE', '"recipes_recipeingredientamount"', 'SET'],
+            ['UPDATE', '"recipes_recipe"', 'SET'],
+        ])
+
+    def test_recipe_create_image_limits(self):
+        image_file = BytesIO()
+        Image.new('RGB', (50, 40)).save(image_file, format='PNG')
+        data = {
+            "ingredients": [
+                {"id": self.ingredient_unit.pk, "amount": 10},
+            ],
+            "tags": [
+                self.tag.pk,
+            ],
+            "image": 'data:image/png;base64,' + base64.b64encode(
+                image_file.getvalue()
+            ).decode(),
+            "text": "TestCreate",
+            "cooking_time": 1,
+        }
+        limits = (
+            ({'BASE64_IMAGE_MAX_SIZE': 10}, HTTPStatus.BAD_REQUEST),
+            ({'BASE64_IMAGE_MAX_WIDTH': 49}, HTTPStatus.BAD_REQUEST),
+            ({'BASE64_IMAGE_MAX_HEIGHT': 39}, HTTPStatus.BAD_REQUEST),
+            ({'FILE_UPLOAD_MAX_MEMORY_SIZE': 10}, HTTPStatus.CREATED),
+            ({}, HTTPStatus.CREATED),
+        )
+        for index, (limit_settings, expected_status) in enumerate(limits):
+            with self.subTest(limit_settings=limit_settings):
+                with override_settings(**limit_settings):
+                    response = self.authorised_user.post(
+                        __class__.url,
+                        data={**data, "name": f"Testimage{index}"},
+                        format='json',
+                    )
+                self.assertEqual(response.status_code, expected_status)
+                if expected_status == HTTPStatus.BAD_REQUEST:
+                    self.assertIn('image', response.data)
+
+        response = self.authorised_user.post(
+            __class__.url,
+            data={**data, "name": "Testinvalid", "image": data["image"][:-9]},
+            format='json',
+        )
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        self.assertIn('image', response.data)
+
+    def test_recipe_create_wrapped_base64_image(self):
+        image_file = BytesIO()
+        Image.effect_noise((50, 40), 64).convert('RGB').save(
+            image_file, format='PNG',
+        )
+        data = {
+            "ingredients": [
+                {"id": self.ingredient_unit.pk, "amount": 10},
+            ],
+            "tags": [
+                self.tag.pk,
+            ],
+            "image": 'data:image/png;base64,' + base64.encodebytes(
+                image_file.getvalue()
+            ).decode().replace('\n', '\r\n '),
+            "name": "Testwrapped",
+            "text": "TestCreate",
+            "cooking_time": 1,
+        }
+        with mock.patch.object(Base64ImageField, 'CHUNK_SIZE', 64):
+            with override_settings(BASE64_IMAGE_MAX_WIDTH=49):
+                response = self.authorised_user.post(
+                    __class__.url, data=data, format='json',
+                )
+            self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+            self.assertIn('image', response.data)
+
+            response = self.authorised_user.post(
+                __class__.url, data=data, format='json',
+            )
+        self.assertEqual(response.status_code, HTTPStatus.CREATED)
+        recipe = Recipe.objects.get(pk=response.data['id'])
+        with recipe.image.open('rb') as file:
+            self.assertEqual(file.read(), image_file.getvalue())
+
+    def test_recipe_create_image_header_after_max_header_size(self):
+        image_file = BytesIO()
+        Image.new('RGB', (50, 40)).save(
+            image_file, format='JPEG', exif=b'Exif\x00\x00' + bytes(60000),
+        )
+        data = {
+            "ingredients": [
+                {"id": self.ingredient_unit.pk, "amount": 10},
+            ],
+            "tags": [
+                self.tag.pk,
+            ],
+            "image": 'data:image/jpeg;base64,' + base64.b64encode(
+                image_file.getvalue()
+            ).decode(),
+            "name": "Testheader",
+            "text": "TestCreate",
+            "cooking_time": 1,
+        }
+        with mock.patch.object(Base64ImageField, 'MAX_HEADER_SIZE', 1024):
+            with override_settings(BASE64_IMAGE_MAX_WIDTH=49):
+                response = self.authorised_user.post(
+                    __class__.url, data=data, format='json',
+                )
+            self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+            self.assertIn('image', response.data)
+
+            response = self.authorised_user.post(
+                __class__.url, data=data, format='json',
+            )
+            self.assertEqual(response.status_code, HTTPStatus.CREATED)
@@ -0,0 +1,180 @@
+from http import HTTPStatus
+from unittest import mock
+
+from django.db.models import Sum
+from django.db.models.signals import m2m_changed
+from rest_framework.test import APIClient, APITestCase
+
+from api.cache import get_user_recipe_ids
+from api.db import SINGLE_QUERY_INSERT, insert_ignoring_conflicts
+from recipes.models import (Favorite, Recipe, ShoppingCartIngredient,
+                            ShoppingCartItem)
+from tests.factories import RecipeWithIngredientAmountFactory, UserFactory
+
+BULK_URLS = {
+    'favorites': '/api/recipes/favorite/',
+    'shopping_cart': '/api/recipes/shopping_cart/',
+}
+
+
+class RecipesBulkTestCase(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = UserFactory()
+        cls.recipes = RecipeWithIngredientAmountFactory.create_batch(size=3)
+        cls.missing_id = Recipe.objects.order_by('-pk').first().pk + 1
+
+    def setUp(self):
+        self.unauthorised_user = APIClient()
+
+        self.authorised_user = APIClient()
+        self.authorised_user.force_authenticate(__class__.user)
+
+    def test_bulk_unauthorised(self):
+        for url in BULK_URLS.values():
+            with self.subTest(url=url):
+                response = self.unauthorised_user.post(
+                    url, data={'recipes': [__class__.recipes[0].pk]},
+                    format='json',
+                )
+                self.assertEqual(
+                    response.status_code, HTTPStatus.UNAUTHORIZED
+                )
+
+    def test_bulk_invalid_data(self):
+        for data in ({}, {'recipes': []}, {'recipes': ['a']}):
+            with self.subTest(data=data):
+                response = self.authorised_user.post(
+                    BULK_URLS['favorites'], data=data, format='json',
+                )
+                self.assertEqual(
+                    response.status_code, HTTPStatus.BAD_REQUEST
+                )
+
+    def test_bulk_add_and_remove(self):
+        first, second, third = (recipe.pk for recipe in __class__.recipes)
+        for relation, url in BULK_URLS.items():
+            with self.subTest(relation=relation):
+                user_items = getattr(__class__.user, relation)
+                user_items.add(first)
+                get_user_recipe_ids(__class__.user)
+
+                response = self.authorised_user.post(
+                    url,
+                    data={'recipes': [first, second, __class__.missing_id]},
+                    format='json',
+                )
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertEqual(response.data['results'], [
+                    {'id': first, 'status': 'already_added'},
+                    {'id': second, 'status': 'added'},
+                    {'id': __class__.missing_id, 'status': 'not_found'},
+                ])
+                self.assertEqual(
+                    get_user_recipe_ids(__class__.user)[relation],
+                    {first, second},
+                )
+
+                response = self.authorised_user.delete(
+                    url, data={'recipes': [second, third]}, format='json',
+                )
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertEqual(response.data['results'], [
+                    {'id': second, 'status': 'removed'},
+                    {'id': third, 'status': 'already_removed'},
+                ])
+                self.assertEqual(
+                    set(user_items.values_list('pk', flat=True)), {first},
+                )
+                self.assertEqual(
+                    get_user_recipe_ids(__class__.user)[relation], {first},
+                )
+
+        self.assertEqual(
+            ShoppingCartIngredient.objects.filter(
+                user=__class__.user,
+            ).count(),
+            2,
+        )
+
+    def test_bulk_add_skips_concurrently_added_recipes(self):
+        first, second = (recipe.pk for recipe in __class__.recipes[:2])
+
+        def add_concurrently(sender, action, **kwargs):
+            """Add the first recipe as a concurrent request would."""
+            if action == 'pre_add':
+                ShoppingCartItem.objects.create(
+                    user=__class__.user, recipe_id=first,
+                )
+                ShoppingCartIngredient.objects.add_recipes(
+                    [__class__.user.pk], [first],
+                )
+
+        m2m_changed.connect(add_concurrently, sender=ShoppingCartItem)
+        try:
+            response = self.authorised_user.post(
+                BULK_URLS['shopping_cart'],
+                data={'recipes': [first, second]},
+                format='json',
+            )
+        finally:
+            m2m_changed.disconnect(add_concurrently, sender=ShoppingCartItem)
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.data['results'], [
+            {'id': first, 'status': 'already_added'},
+            {'id': second, 'status': 'added'},
+        ])
+        self.assertEqual(
+            dict(
+                ShoppingCartIngredient.objects.filter(
+                    user=__class__.user,
+                ).values_list('ingredient_unit', 'total_amount')
+            ),
+            dict(
+                __class__.user.shopping_cart.values_list(
+                    'recipeingredientamount__ingredient_unit',
+                ).annotate(
+                    total_amount=Sum('recipeingredientamount__amount'),
+                )
+            ),
+        )
+
+
+class InsertIgnoringConflictsTestCase(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = UserFactory()
+        cls.recipes = RecipeWithIngredientAmountFactory.create_batch(size=3)
+
+    def setUp(self):
+        __class__.user.favorites.add(__class__.recipes[0])
+
+    def insert_favorites(self):
+        return insert_ignoring_conflicts(
+            Favorite,
+            (
+                Favorite(user=__class__.user, recipe=recipe)
+                for recipe in __class__.recipes
+            ),
+            returning='recipe',
+        )
+
+    def test_insert_ignoring_conflicts_single_query(self):
+        self.assertTrue(SINGLE_QUERY_INSERT)
+        with self.assertNumQueries(1):
+            inserted = self.insert_favorites()
+        self.assertEqual(
+            inserted, {recipe.pk for recipe in __class__.recipes[1:]},
+        )
+        self.assertEqual(__class__.user.favorites.count(), 3)
+
+    def test_insert_ignoring_conflicts_one_by_one(self):
+        with mock.patch('api.db.SINGLE_QUERY_INSERT', False):
+            inserted = self.insert_favorites()
+        self.assertEqual(
+            inserted, {recipe.pk for recipe in __class__.recipes[1:]},
+        )
+        self.assertEqual(__class__.user.favorites.count(), 3)
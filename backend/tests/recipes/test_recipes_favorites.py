@@ -0,0 +1,54 @@
+from http import HTTPStatus
+
+from rest_framework.test import APIClient, APITestCase
+
+from tests.factories import RecipeFactory, UserFactory
+
+RECIPES_FAVORITES_URL = '/api/recipes/favorites/'
+FAVORITE_URL = '/api/recipes/{recipe_pk}/favorite/'.format
+
+
+class RecipesFavoritesTestCase(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = UserFactory()
+        cls.recipes = RecipeFactory.create_batch(size=5)
+
+    def setUp(self):
+        self.unauthorised_user = APIClient()
+
+        self.authorised_user = APIClient()
+        self.authorised_user.force_authenticate(__class__.user)
+
+    def test_recipes_favorites_unauthorised(self):
+        response = self.unauthorised_user.get(RECIPES_FAVORITES_URL)
+
+        self.assertEqual(
+            response.status_code, HTTPStatus.UNAUTHORIZED
+        )
+
+    def test_recipes_favorites_most_recent_first(self):
+        added_recipes = [
+            __class__.recipes[3], __class__.recipes[0], __class__.recipes[4],
+        ]
+        for recipe in added_recipes:
+            self.authorised_user.post(FAVORITE_URL(recipe_pk=recipe.pk))
+
+        recipe_ids = []
+        url = f'{RECIPES_FAVORITES_URL}?limit=2'
+        while url:
+            response = self.authorised_user.get(url)
+            self.assertEqual(response.status_code, HTTPStatus.OK)
+            self.assertLessEqual(len(response.data['results']), 2)
+            self.assertTrue(all(
+                recipe['is_favorited'] for recipe in response.data['results']
+            ))
+            recipe_ids.extend(
+                recipe['id'] for recipe in response.data['results']
+            )
+            url = response.data['next']
+
+        self.assertEqual(
+            recipe_ids, [recipe.pk for recipe in reversed(added_recipes)],
+        )
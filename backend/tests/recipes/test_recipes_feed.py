@@ -0,0 +1,116 @@
+from http import HTTPStatus
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.test import override_settings
+from rest_framework.test import APIClient, APITestCase
+
+from recipes.models import FeedEntry
+from tests.factories import (IngredientUnitFactory, RecipeFactory,
+                             TagFactory, UserFactory)
+
+RECIPES_FEED_URL = '/api/recipes/feed/'
+SUBSCRIBE_URL = '/api/users/{user_pk}/subscribe/'.format
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class RecipesFeedTestCase(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = UserFactory()
+        cls.author = UserFactory()
+        cls.another_author = UserFactory()
+        cls.author_recipes = RecipeFactory.create_batch(
+            size=3, author=cls.author,
+        )
+        RecipeFactory.create_batch(size=2, author=cls.another_author)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.unauthorised_user = APIClient()
+
+        self.authorised_user = APIClient()
+        self.authorised_user.force_authenticate(__class__.user)
+
+        self.author_client = APIClient()
+        self.author_client.force_authenticate(__class__.author)
+
+    def get_feed_recipe_ids(self, **params):
+        response = self.authorised_user.get(RECIPES_FEED_URL, data=params)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        return [recipe['id'] for recipe in response.data['results']]
+
+    def test_recipes_feed_unauthorised(self):
+        response = self.unauthorised_user.get(RECIPES_FEED_URL)
+
+        self.assertEqual(
+            response.status_code, HTTPStatus.UNAUTHORIZED
+        )
+
+    def test_recipes_feed_backfilled_and_pruned_on_subscribe(self):
+        self.assertEqual(self.get_feed_recipe_ids(), [])
+
+        self.authorised_user.post(SUBSCRIBE_URL(user_pk=__class__.author.pk))
+        expected_ids = sorted(
+            (recipe.pk for recipe in __class__.author_recipes),
+            reverse=True,
+        )
+        self.assertEqual(self.get_feed_recipe_ids(), expected_ids)
+
+        self.authorised_user.delete(
+            SUBSCRIBE_URL(user_pk=__class__.author.pk)
+        )
+        self.assertEqual(self.get_feed_recipe_ids(), [])
+
+    def test_recipes_feed_fan_out_on_recipe_create(self):
+        self.authorised_user.post(SUBSCRIBE_URL(user_pk=__class__.author.pk))
+        ingredient_unit = IngredientUnitFactory()
+        data = {
+            "ingredients": [{"id": ingredient_unit.pk, "amount": 10}],
+            "tags": [TagFactory().pk],
+            "image": ("data:image/png;base64,iVBORw0KGgoAAAANSUh"
+                      "EUgAAAAEAAAABAgMAAABieywaAAAACVBMVEUAAAD///"
+                      "9fX1/S0ecCAAAACXBIWXMAAA7EAAAOxAGVKw4bAAAAC"
+                      "klEQVQImWNoAAAAggCByxOyYQAAAABJRU5ErkJggg=="),
+            "name": "Feedrecipe",
+            "text": "Feed recipe",
+            "cooking_time": 1,
+        }
+        response = self.author_client.post(
+            '/api/recipes/', data=data, format='json',
+        )
+        self.assertEqual(response.status_code, HTTPStatus.CREATED)
+
+        self.assertEqual(self.get_feed_recipe_ids()[0], response.data['id'])
+        self.assertFalse(
+            FeedEntry.objects.filter(subscriber=__class__.author).exists()
+        )
+
+    def test_recipes_feed_keyset_pagination(self):
+        for author in (__class__.author, __class__.another_author):
+            self.authorised_user.post(SUBSCRIBE_URL(user_pk=author.pk))
+
+        recipe_ids = []
+        url = f'{RECIPES_FEED_URL}?limit=2'
+        while url:
+            response = self.authorised_user.get(url)
+            self.assertLessEqual(len(response.data['results']), 2)
+            recipe_ids.extend(
+                recipe['id'] for recipe in response.data['results']
+            )
+            url = response.data['next']
+
+        self.assertEqual(
+            recipe_ids,
+            list(FeedEntry.objects.filter(
+                subscriber=__class__.user,
+            ).values_list('recipe', flat=True)),
+        )
+        self.assertEqual(len(recipe_ids), 5)
@@ -1,12 +1,16 @@
 from http import HTTPStatus
 from collections import OrderedDict
 
+from django.db import connection
 from django.db.models import Case, When
 from django.conf import settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import (APIClient, APITestCase,
                                  APIRequestFactory, force_authenticate)
 from rest_framework.utils.serializer_helpers import ReturnList
 
+from api.cache import get_user_recipe_ids
+from api.pagination import KeysetPagination
 from api.views import RecipeViewset
 from recipes.models import Recipe
 from tests.factories import (UserFactory, TagFactory,
@@ -99,6 +103,9 @@ class RecipesListTestCase(APITestCase):
         expected_response = RecipeListDetailSerializer(
             all_recipes[:PAGE_LIMIT],
             many=True,
+            context={
+                'user_recipe_ids': get_user_recipe_ids(__class__.user),
+            },
         ).data
         print(response.data)
         self.assertEqual(
@@ -129,6 +136,7 @@ class RecipesListTestCase(APITestCase):
             'is_in_shopping_cart',
             'name',
             'image',
+            'image_variants',
             'text',
             'cooking_time',
         }
@@ -211,6 +219,69 @@ class RecipesListTestCase(APITestCase):
         self.assertEqual(response.data.get('results'), expected_response)
         self.assertEqual(response.data.get('count'), 0)
 
+    def test_recipes_list_reflects_user_recipes_changes(self):
+        recipe = __class__.recipes.first()
+        response = self.authorised_user.get(__class__.url)
+        self.assertTrue(response.data['results'][0]['is_favorited'])
+
+        self.authorised_user.delete(f'{__class__.url}{recipe.pk}/favorite/')
+        response = self.authorised_user.get(__class__.url)
+        self.assertFalse(response.data['results'][0]['is_favorited'])
+
+        __class__.user.favorites.add(recipe)
+        response = self.authorised_user.get(
+            __class__.url, data={'is_favorited': True},
+        )
+        self.assertEqual(response.data.get('count'), len(__class__.recipes))
+
+    def test_recipes_list_cached_representations(self):
+        self.authorised_user.get(__class__.url)
+        with self.assertNumQueries(3):
+            response = self.authorised_user.get(__class__.url)
+        self.assertEqual(
+            response.status_code, HTTPStatus.OK
+        )
+
+        __class__.tag.name = 'Обновленный'
+        __class__.tag.save()
+        response = self.authorised_user.get(__class__.url)
+        for recipe in response.data['results']:
+            self.assertEqual(recipe['tags'][0]['name'], 'Обновленный')
+
+    def test_recipes_list_sparse_fieldsets(self):
+        request_params = [
+            ({'fields': 'name,image,cooking_time,tags,author'},
+             {'id', 'name', 'image', 'cooking_time', 'tags', 'author'}),
+            ({'omit': 'id,text,ingredients,author'},
+             {'id', 'name', 'image', 'image_variants', 'cooking_time',
+              'tags', 'is_favorited', 'is_in_shopping_cart'}),
+            ({'fields': 'name,unknown', 'omit': 'name'}, {'id'}),
+        ]
+        for data, expected_fields in request_params:
+            with self.subTest(data=data):
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.authorised_user.get(
+                        __class__.url, data=data,
+                    )
+                self.assertEqual(
+                    response.status_code, HTTPStatus.OK
+                )
+                for recipe in response.data['results']:
+                    self.assertEqual(set(recipe), expected_fields)
+                for query in queries.captured_queries:
+                    self.assertNotIn(
+                        'recipeingredientamount', query['sql'],
+                    )
+
+        response = self.authorised_user.get(
+            f'{__class__.url}{__class__.recipes.first().pk}/',
+            data={'fields': 'is_favorited'},
+        )
+        self.assertEqual(
+            response.data, {'id': __class__.recipes.first().pk,
+                            'is_favorited': True}
+        )
+
     def test_recipes_list_filter_by_tags(self):
         another_tag = TagFactory()
         request_params = [
@@ -232,6 +303,27 @@ class RecipesListTestCase(APITestCase):
                     response.data.get('count'), tagged_recipies_count
                 )
 
+    def test_recipes_list_filter_by_all_tags(self):
+        another_tag = TagFactory()
+        recipe = __class__.recipes.first()
+        recipe.tags.add(another_tag)
+        request_params = [
+            ({'tags': [__class__.tag.slug, another_tag.slug]},
+             len(__class__.recipes)),
+            ({'tags': [__class__.tag.slug, another_tag.slug],
+              'tags_match': 'any'}, len(__class__.recipes)),
+            ({'tags': [__class__.tag.slug, another_tag.slug],
+              'tags_match': 'all'}, 1),
+            ({'tags': [another_tag.slug], 'tags_match': 'all'}, 1),
+        ]
+        for data, expected_count in request_params:
+            with self.subTest(data=data):
+                response = self.authorised_user.get(__class__.url, data=data)
+                self.assertEqual(
+                    response.status_code, HTTPStatus.OK
+                )
+                self.assertEqual(response.data.get('count'), expected_count)
+
     def test_recipes_list_filter_by_author(self):
         another_user = UserFactory()
         request_params = [
@@ -252,3 +344,59 @@ class RecipesListTestCase(APITestCase):
                 self.assertEqual(
                     response.data.get('count'), tagged_recipies_count
                 )
+
+    def test_recipes_list_filter_by_normalized_name(self):
+        recipe = RecipeWithIngredientAmountFactory(name='Ёжики  в томате')
+        for name in ('ежики в томате', 'ЁЖИКИ В ', 'в томате'):
+            with self.subTest(name=name):
+                response = self.unauthorised_user.get(
+                    __class__.url, data={'name': name},
+                )
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertEqual(
+                    [item['id'] for item in response.data['results']],
+                    [recipe.pk],
+                )
+
+    def test_recipes_list_cursor_pagination(self):
+        expected_ids = list(
+            __class__.recipes.order_by(
+                '-pub_date', 'name', 'id'
+            ).values_list('id', flat=True)
+        )
+        recipe_ids = []
+        url = f'{__class__.url}?cursor=&limit=2&tags={__class__.tag.slug}'
+        while url:
+            response = self.authorised_user.get(url)
+            self.assertEqual(
+                response.status_code, HTTPStatus.OK
+            )
+            self.assertNotIn('count', response.data)
+            self.assertLessEqual(len(response.data['results']), 2)
+            recipe_ids.extend(
+                recipe['id'] for recipe in response.data['results']
+            )
+            url = response.data['next']
+
+        self.assertEqual(recipe_ids, expected_ids)
+
+    def test_recipes_list_invalid_cursor(self):
+        response = self.authorised_user.get(
+            __class__.url, data={'cursor': 'invalid'}
+        )
+        self.assertEqual(
+            response.status_code, HTTPStatus.NOT_FOUND
+        )
+
+    def test_recipes_list_cursor_with_invalid_values(self):
+        for position in (['garbage', 'x', 1], [None, [], {}]):
+            with self.subTest(position=position):
+                response = self.authorised_user.get(
+                    __class__.url,
+                    data={
+                        'cursor': KeysetPagination.encode_cursor(position),
+                    },
+                )
+                self.assertEqual(
+                    response.status_code, HTTPStatus.NOT_FOUND
+                )
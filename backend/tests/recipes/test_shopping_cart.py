@@ -0,0 +1,190 @@
+import json
+from http import HTTPStatus
+
+from django.db import connection
+from django.db.models import Sum
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient, APITestCase
+
+from recipes.models import Recipe, ShoppingCartIngredient
+from tests.factories import (IngredientUnitFactory, RecipeFactory,
+                             RecipeIngredientAmountFactory, TagFactory,
+                             UserFactory)
+
+SHOPPING_CART_URL = '/api/recipes/{recipe_pk}/shopping_cart/'.format
+DOWNLOAD_SHOPPING_CART_URL = '/api/recipes/download_shopping_cart/'
+
+
+class ShoppingCartTestCase(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = UserFactory()
+        cls.author = UserFactory()
+        cls.shared_unit = IngredientUnitFactory()
+        cls.recipes = RecipeFactory.create_batch(size=2, author=cls.author)
+        for recipe, amount in zip(cls.recipes, (10, 5)):
+            RecipeIngredientAmountFactory(
+                recipe=recipe, ingredient_unit=cls.shared_unit, amount=amount,
+            )
+            RecipeIngredientAmountFactory(recipe=recipe, amount=amount)
+
+    def setUp(self):
+        self.authorised_user = APIClient()
+        self.authorised_user.force_authenticate(__class__.user)
+
+        self.author_client = APIClient()
+        self.author_client.force_authenticate(__class__.author)
+
+    def get_cart_totals(self):
+        return dict(
+            ShoppingCartIngredient.objects.filter(
+                user=__class__.user,
+            ).values_list('ingredient_unit', 'total_amount')
+        )
+
+    def get_expected_totals(self):
+        """Aggregate the cart recipe ingredients from scratch."""
+        return {
+            ingredient_unit_id: total_amount
+            for ingredient_unit_id, total_amount
+            in __class__.user.shopping_cart.values_list(
+                'recipeingredientamount__ingredient_unit',
+            ).annotate(
+                total_amount=Sum('recipeingredientamount__amount'),
+            )
+        }
+
+    def test_shopping_cart_totals_follow_cart_changes(self):
+        for recipe in __class__.recipes:
+            response = self.authorised_user.post(
+                SHOPPING_CART_URL(recipe_pk=recipe.pk)
+            )
+            self.assertEqual(response.status_code, HTTPStatus.CREATED)
+        self.assertEqual(self.get_cart_totals()[__class__.shared_unit.pk], 15)
+        self.assertEqual(self.get_cart_totals(), self.get_expected_totals())
+
+        self.authorised_user.delete(
+            SHOPPING_CART_URL(recipe_pk=__class__.recipes[0].pk)
+        )
+        self.assertEqual(self.get_cart_totals()[__class__.shared_unit.pk], 5)
+        self.assertEqual(self.get_cart_totals(), self.get_expected_totals())
+
+        __class__.user.shopping_cart.clear()
+        self.assertEqual(self.get_cart_totals(), {})
+
+    def test_shopping_cart_totals_follow_recipe_changes(self):
+        recipe = __class__.recipes[0]
+        __class__.user.shopping_cart.add(*__class__.recipes)
+        new_unit = IngredientUnitFactory()
+        data = {
+            'ingredients': [
+                {'id': __class__.shared_unit.pk, 'amount': 1},
+                {'id': new_unit.pk, 'amount': 7},
+            ],
+            'tags': [TagFactory().pk],
+        }
+        response = self.author_client.patch(
+            f'/api/recipes/{recipe.pk}/', data=data, format='json',
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(self.get_cart_totals()[__class__.shared_unit.pk], 6)
+        self.assertEqual(self.get_cart_totals()[new_unit.pk], 7)
+        self.assertEqual(self.get_cart_totals(), self.get_expected_totals())
+
+        Recipe.objects.get(pk=recipe.pk).delete()
+        self.assertEqual(self.get_cart_totals(), self.get_expected_totals())
+
+    def test_download_shopping_cart(self):
+        __class__.user.shopping_cart.add(*__class__.recipes)
+        ingredient = __class__.shared_unit.ingredient
+        unit = __class__.shared_unit.measurement_unit
+
+        response = self.authorised_user.get(DOWNLOAD_SHOPPING_CART_URL)
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        lines = b''.join(
+            response.streaming_content
+        ).decode().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertIn(f'{ingredient.name}({unit.name}): 15', lines)
+
+    def test_download_shopping_cart_formats(self):
+        __class__.user.shopping_cart.add(*__class__.recipes)
+        ingredient = __class__.shared_unit.ingredient
+        unit = __class__.shared_unit.measurement_unit
+        expected_rows = {
+            'csv': f'{ingredient.name},{unit.name},15\r\n',
+            'md': f'| {ingredient.name} | {unit.name} | 15 |\n',
+        }
+        for format, expected_row in expected_rows.items():
+            with self.subTest(format=format):
+                response = self.authorised_user.get(
+                    DOWNLOAD_SHOPPING_CART_URL, data={'format': format},
+                )
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertIn(
+                    f'ingredients.{format}', response['Content-Disposition'],
+                )
+                content = b''.join(response.streaming_content).decode()
+                self.assertIn(expected_row, content)
+
+        response = self.authorised_user.get(
+            DOWNLOAD_SHOPPING_CART_URL, data={'format': 'json'},
+        )
+        items = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(len(items), 3)
+        self.assertIn(
+            {
+                'name': ingredient.name,
+                'measurement_unit': unit.name,
+                'amount': 15,
+            },
+            items,
+        )
+
+        response = self.authorised_user.get(
+            DOWNLOAD_SHOPPING_CART_URL, data={'format': 'pdf'},
+        )
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_toggle_does_not_touch_user_row(self):
+        recipe = __class__.recipes[0]
+        for url in (SHOPPING_CART_URL(recipe_pk=recipe.pk),
+                    f'/api/recipes/{recipe.pk}/favorite/'):
+            with self.subTest(url=url):
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.authorised_user.post(url)
+                    self.assertEqual(
+                        response.status_code, HTTPStatus.CREATED
+                    )
+                    response = self.authorised_user.post(url)
+                    self.assertEqual(
+                        response.status_code, HTTPStatus.BAD_REQUEST
+                    )
+                    response = self.authorised_user.delete(url)
+                    self.assertEqual(
+                        response.status_code, HTTPStatus.NO_CONTENT
+                    )
+                    response = self.authorised_user.delete(url)
+                    self.assertEqual(
+                        response.status_code, HTTPStatus.BAD_REQUEST
+                    )
+                self.assertFalse(any(
+                    query['sql'].startswith('UPDATE "users_user"')
+                    for query in queries.captured_queries
+                ))
+        self.assertEqual(self.get_cart_totals(), {})
+
+    def test_toggle_does_not_prefetch_recipe_relations(self):
+        recipe = __class__.recipes[1]
+        for url in (SHOPPING_CART_URL(recipe_pk=recipe.pk),
+                    f'/api/recipes/{recipe.pk}/favorite/'):
+            with self.subTest(url=url):
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.authorised_user.post(url)
+                self.assertEqual(response.status_code, HTTPStatus.CREATED)
+                self.assertFalse(any(
+                    '_prefetch_related_val_' in query['sql']
+                    for query in queries.captured_queries
+                ))
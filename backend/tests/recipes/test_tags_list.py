@@ -1,6 +1,7 @@
 import re
 from http import HTTPStatus
 
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIClient, APITestCase
 from recipes.models import Tag
 
@@ -64,3 +65,11 @@ class TagsListTestCase(APITestCase):
         self.assertTrue(
             re.fullmatch(regex, first_tag_obj_color),
         )
+
+    def test_tags_list_matches_model_serializer_output(self):
+        response = self.unauthorised_user.get(__class__.url)
+
+        expected_content = JSONRenderer().render(
+            TagSerializer(__class__.tags, many=True).data
+        )
+        self.assertEqual(response.content, expected_content)
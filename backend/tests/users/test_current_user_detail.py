@@ -57,5 +57,8 @@ class CurrentUserDetailTestCase(APITestCase):
             'last_name',
             'email',
             'is_subscribed',
+            'recipes_count',
+            'followers_count',
+            'following_count',
         }
         self.assertEqual(single_user_fields, expected_user_fields)
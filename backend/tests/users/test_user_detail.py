@@ -1,12 +1,14 @@
 from http import HTTPStatus
+from io import StringIO
 
 from rest_framework.test import (APIClient, APITestCase,
                                  APIRequestFactory, force_authenticate)
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
 
 from api.views import CustomUserViewSet
 from users.models import Subscription
-from tests.factories import UserFactory, SubscriptionFactory
+from tests.factories import RecipeFactory, UserFactory, SubscriptionFactory
 from api.serializers import CustomUserSerializer
 
 
@@ -73,6 +75,9 @@ class UserDetailTestCase(APITestCase):
             'last_name',
             'email',
             'is_subscribed',
+            'recipes_count',
+            'followers_count',
+            'following_count',
         }
         self.assertEqual(single_user_fields, expected_user_fields)
 
@@ -100,3 +105,28 @@ class UserDetailTestCase(APITestCase):
             'is_subscribed'
         )
         self.assertFalse(detail_user_is_subscribed_field)
+
+    def test_user_detail_counters(self):
+        subscriber = UserFactory()
+        subscriber_client = APIClient()
+        subscriber_client.force_authenticate(subscriber)
+        subscriber_client.post(f'{__class__.url}subscribe/')
+        recipes = RecipeFactory.create_batch(size=2, author=__class__.user)
+        recipes[0].delete()
+
+        response = self.another_authorised_user.get(__class__.url)
+        self.assertEqual(response.data['recipes_count'], 1)
+        self.assertEqual(response.data['followers_count'], 1)
+        self.assertEqual(response.data['following_count'], 0)
+
+        subscriber_client.delete(f'{__class__.url}subscribe/')
+        subscriber.refresh_from_db()
+        self.assertEqual(subscriber.following_count, 0)
+
+        User.objects.filter(pk=__class__.user.pk).update(
+            recipes_count=5, followers_count=3,
+        )
+        call_command('reconcileusercounters', stdout=StringIO())
+        response = self.another_authorised_user.get(__class__.url)
+        self.assertEqual(response.data['recipes_count'], 1)
+        self.assertEqual(response.data['followers_count'], 0)
@@ -5,7 +5,7 @@ from rest_framework.exceptions import ErrorDetail
 from django.contrib.auth import get_user_model
 from django.contrib.auth.hashers import check_password
 
-from tests.factories import UserFactory
+from tests.factories import SubscriptionFactory, UserFactory
 
 
 User = get_user_model()
@@ -122,3 +122,26 @@ class UserSetPasswordTestCase(APITestCase):
         self.assertEqual(
             response.data, expected_response
         )
+
+    def test_user_set_password_keeps_counters(self):
+        user = UserFactory()
+        current_password = 'OLD_Dyskig-fubnas-dozby1'
+        user.set_password(current_password)
+        user.save()
+        SubscriptionFactory(author=user)
+        client = APIClient()
+        client.force_authenticate(user)
+
+        response = client.post(
+            __class__.url,
+            data={
+                "current_password": current_password,
+                "new_password": "Dyskig-fubnas-dozby1NEW",
+            },
+        )
+        self.assertEqual(
+            response.status_code, HTTPStatus.NO_CONTENT
+        )
+        user.refresh_from_db()
+        self.assertEqual(user.followers_count, 1)
+        self.assertTrue(user.check_password("Dyskig-fubnas-dozby1NEW"))
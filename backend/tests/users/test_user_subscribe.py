@@ -1,9 +1,16 @@
 from http import HTTPStatus
+from unittest import mock
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient, APITestCase
 
-from tests.factories import UserFactory, SubscriptionFactory
-from users.models import Subscription
+from api.db import insert_ignoring_conflicts
+from recipes.models import FeedEntry
+from tests.factories import RecipeFactory, SubscriptionFactory, UserFactory
+from users.models import Subscription, User
+
+BULK_SUBSCRIBE_URL = '/api/users/subscribe/'
 
 
 class UserSubscriptionsTestCase(APITestCase):
@@ -73,6 +80,22 @@ class UserSubscriptionsTestCase(APITestCase):
             author=some_author
         ).exists())
 
+    def test_user_subscribe_delete_with_drifted_counters(self):
+        some_author = UserFactory()
+        SubscriptionFactory(user=__class__.user, author=some_author)
+        User.objects.filter(
+            pk__in=[__class__.user.pk, some_author.pk],
+        ).update(followers_count=0, following_count=0)
+
+        response = self.authorised_user.delete(
+            __class__.url(user_pk=some_author.pk))
+
+        self.assertEqual(
+            response.status_code, HTTPStatus.NO_CONTENT
+        )
+        some_author.refresh_from_db()
+        self.assertEqual(some_author.followers_count, 0)
+
     def test_user_subscribe_to_themselvres_400(self):
         request_user = __class__.user
         response = self.authorised_user.post(
@@ -116,3 +139,118 @@ class UserSubscriptionsTestCase(APITestCase):
         self.assertEqual(
             response.status_code, HTTPStatus.BAD_REQUEST
         )
+
+    def test_user_bulk_subscribe(self):
+        subscribed, new = UserFactory(), UserFactory()
+        missing_id = new.pk + 1
+        RecipeFactory(author=new)
+        SubscriptionFactory(user=__class__.user, author=subscribed)
+
+        response = self.authorised_user.post(
+            BULK_SUBSCRIBE_URL,
+            data={'authors': [
+                subscribed.pk, new.pk, __class__.user.pk, missing_id,
+            ]},
+            format='json',
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.data['results'], [
+            {'id': subscribed.pk, 'status': 'already_subscribed'},
+            {'id': new.pk, 'status': 'subscribed'},
+            {'id': __class__.user.pk, 'status': 'not_found'},
+            {'id': missing_id, 'status': 'not_found'},
+        ])
+        self.assertTrue(FeedEntry.objects.filter(
+            subscriber=__class__.user, author=new,
+        ).exists())
+        new.refresh_from_db()
+        self.assertEqual(new.followers_count, 1)
+
+        response = self.authorised_user.delete(
+            BULK_SUBSCRIBE_URL,
+            data={'authors': [subscribed.pk, new.pk, __class__.user.pk]},
+            format='json',
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(
+            [result['status'] for result in response.data['results']],
+            ['unsubscribed', 'unsubscribed', 'not_found'],
+        )
+        self.assertFalse(
+            Subscription.objects.filter(user=__class__.user).exists()
+        )
+        self.assertFalse(
+            FeedEntry.objects.filter(subscriber=__class__.user).exists()
+        )
+        __class__.user.refresh_from_db()
+        self.assertEqual(__class__.user.following_count, 0)
+
+    def test_user_bulk_subscribe_skips_concurrent_subscriptions(self):
+        user, first, second = UserFactory(), UserFactory(), UserFactory()
+        RecipeFactory(author=first)
+        client = APIClient()
+        client.force_authenticate(user)
+
+        def insert_after_concurrent_request(*args, **kwargs):
+            """Subscribe to the first author as a concurrent request would."""
+            Subscription.objects.create(user=user, author=first)
+            FeedEntry.objects.backfill(user, first)
+            return insert_ignoring_conflicts(*args, **kwargs)
+
+        with mock.patch(
+            'api.views.insert_ignoring_conflicts',
+            side_effect=insert_after_concurrent_request,
+        ):
+            response = client.post(
+                BULK_SUBSCRIBE_URL,
+                data={'authors': [first.pk, second.pk]},
+                format='json',
+            )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.data['results'], [
+            {'id': first.pk, 'status': 'already_subscribed'},
+            {'id': second.pk, 'status': 'subscribed'},
+        ])
+        for author in (user, first, second):
+            author.refresh_from_db()
+        self.assertEqual(user.following_count, 2)
+        self.assertEqual(first.followers_count, 1)
+        self.assertEqual(second.followers_count, 1)
+        self.assertEqual(
+            FeedEntry.objects.filter(subscriber=user, author=first).count(),
+            first.recipes.count(),
+        )
+
+    def test_user_bulk_subscribe_backfills_feed_in_constant_queries(self):
+        query_counts = []
+        for size in (1, 5):
+            user = UserFactory()
+            authors = UserFactory.create_batch(size=size)
+            latest_recipes = []
+            for author in authors:
+                RecipeFactory.create_batch(size=2, author=author)
+                latest_recipes.append(
+                    author.recipes.order_by('-pub_date', '-id').first()
+                )
+            client = APIClient()
+            client.force_authenticate(user)
+            with mock.patch.object(FeedEntry.objects, 'BACKFILL_LIMIT', 1):
+                with CaptureQueriesContext(connection) as queries:
+                    response = client.post(
+                        BULK_SUBSCRIBE_URL,
+                        data={'authors': [author.pk for author in authors]},
+                        format='json',
+                    )
+            self.assertEqual(response.status_code, HTTPStatus.OK)
+            self.assertEqual(
+                set(
+                    FeedEntry.objects.filter(
+                        subscriber=user,
+                    ).values_list('recipe', flat=True)
+                ),
+                {recipe.pk for recipe in latest_recipes},
+            )
+            query_counts.append(len(queries))
+
+        self.assertEqual(query_counts[0], query_counts[1])
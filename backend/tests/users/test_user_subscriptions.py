@@ -2,7 +2,8 @@ from http import HTTPStatus
 
 from rest_framework.test import APIClient, APITestCase
 
-from tests.factories import UserFactory, SubscriptionFactory
+from recipes.models import Recipe
+from tests.factories import RecipeFactory, UserFactory, SubscriptionFactory
 
 USERS_SUBSCRIPTIONS_URL = '/api/users/subscriptions/'
 
@@ -42,3 +43,26 @@ class UserSubscriptionsTestCase(APITestCase):
             expected_subscriptions_count,
             response_subscriptions_count,
         )
+
+    def test_users_subscriptions_recipes_limit(self):
+        for subscription in __class__.user.subscriptions.all():
+            RecipeFactory.create_batch(size=3, author=subscription.author)
+
+        with self.assertNumQueries(3):
+            response = self.authorised_user.get(
+                __class__.url, data={'recipes_limit': 2},
+            )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        for subscription in response.data['results']:
+            with self.subTest(author=subscription['id']):
+                author_recipes = Recipe.objects.filter(
+                    author=subscription['id'],
+                )
+                self.assertEqual(
+                    [recipe['id'] for recipe in subscription['recipes']],
+                    list(author_recipes.values_list('id', flat=True)[:2]),
+                )
+                self.assertEqual(
+                    subscription['recipes_count'], author_recipes.count(),
+                )
@@ -3,9 +3,12 @@ from django.conf import settings
 
 from rest_framework.test import APIClient, APITestCase
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from tests.factories import UserFactory
 from api.serializers import CustomUserSerializer
+from users.models import Subscription
 
 USERS_LIST_URL = '/api/users/'
 
@@ -21,7 +24,7 @@ class UserListTestCase(APITestCase):
         UserFactory.create_batch(size=(PAGE_LIMIT + 1))
         cls.user = UserFactory()
         cls.url = USERS_LIST_URL
-        cls.users = User.objects.all()
+        cls.users = User.objects.order_by('id')
 
     def setUp(self):
         self.unauthorised_user = APIClient()
@@ -65,5 +68,34 @@ class UserListTestCase(APITestCase):
             'last_name',
             'email',
             'is_subscribed',
+            'recipes_count',
+            'followers_count',
+            'following_count',
         }
         self.assertEqual(first_user_fields, expected_user_fields)
+
+    def test_users_list_is_subscribed_in_one_query(self):
+        authors = list(__class__.users[:PAGE_LIMIT])[1::2]
+        for author in authors:
+            Subscription.objects.create(user=__class__.user, author=author)
+
+        client = APIClient()
+        client.force_authenticate(__class__.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(__class__.url)
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(
+            {
+                user['id'] for user in response.data['results']
+                if user['is_subscribed']
+            },
+            {author.id for author in authors},
+        )
+        self.assertEqual(
+            sum(
+                Subscription._meta.db_table in query['sql']
+                for query in queries.captured_queries
+            ),
+            1,
+        )
@@ -13,11 +13,19 @@ class UserAdmin(BaseUserAdmin):
         'email',
         'first_name',
         'last_name',
-        'added_recipes_count',
+        'recipes_count',
+        'followers_count',
+        'following_count',
     )
     list_filter = ('email', 'username')
     search_fields = ('email', 'first_name', 'last_name', 'username')
-    readonly_fields = ('last_login', 'date_joined')
+    readonly_fields = (
+        'last_login',
+        'date_joined',
+        'recipes_count',
+        'followers_count',
+        'following_count',
+    )
     fieldsets = (
         (None, {'fields': (
             'username',
@@ -29,6 +37,9 @@ class UserAdmin(BaseUserAdmin):
             "is_active",
             'last_login',
             'date_joined',
+            'recipes_count',
+            'followers_count',
+            'following_count',
         )}),
     )
 
@@ -0,0 +1,13 @@
+from django.contrib.auth import get_user_model
+from django.core.management import BaseCommand
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = ('Recounts the recipes, followers and following counters '
+            'of the users whose counters are out of date.')
+
+    def handle(self, *args, **options):
+        count = User.objects.reconcile_counters()
+        self.stdout.write(f'Counters of {count} users are fixed.')
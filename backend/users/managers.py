@@ -1,5 +1,13 @@
 from django.contrib.auth.models import BaseUserManager
 from django.db import models
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+COUNTER_RELATIONS = {
+    'recipes_count': ('recipes', 'author'),
+    'followers_count': ('subscribers', 'author'),
+    'following_count': ('subscriptions', 'user'),
+}
 
 
 class UserRoles(models.TextChoices):
@@ -48,3 +56,55 @@ class UserManager(BaseUserManager):
 
         user.save(using=self._db)
         return user
+
+    def change_counter(self, user_ids, field_name, delta):
+        """
+        Atomically add the delta to the counter field of the users
+        without reading their rows. The counters do not go below zero;
+        drifted counters are fixed by reconcile_counters().
+
+        """
+        return self.filter(pk__in=user_ids).update(
+            **{field_name: Greatest(F(field_name) + delta, 0)}
+        )
+
+    def get_actual_counts(self):
+        """
+        Return the expressions counting the related rows of every
+        counter field, to be used in queries of the users.
+
+        """
+        counts = {}
+        for field_name, (relation, lookup) in COUNTER_RELATIONS.items():
+            related_model = self.model._meta.get_field(relation).related_model
+            counts[field_name] = Coalesce(
+                Subquery(
+                    related_model.objects.filter(
+                        **{lookup: OuterRef('pk')}
+                    ).order_by().values(lookup).annotate(
+                        count=Count('pk'),
+                    ).values('count')
+                ),
+                0,
+            )
+        return counts
+
+    def reconcile_counters(self):
+        """
+        Recount the counters of the users whose counters differ from
+        the actual numbers of their recipes and subscriptions.
+        Return the number of the fixed users.
+
+        """
+        counts = self.get_actual_counts()
+        stale_ids = list(
+            self.annotate(**{
+                f'actual_{field_name}': count
+                for field_name, count in counts.items()
+            }).exclude(**{
+                field_name: F(f'actual_{field_name}')
+                for field_name in counts
+            }).values_list('pk', flat=True)
+        )
+        self.filter(pk__in=stale_ids).update(**counts)
+        return len(stale_ids)
@@ -0,0 +1,63 @@
+# Generated by Django 4.2.4 on 2026-10-17 08:03
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def count(model, lookup):
+    return Coalesce(
+        models.Subquery(
+            model.objects.filter(**{lookup: models.OuterRef('pk')})
+            .order_by()
+            .values(lookup)
+            .annotate(count=models.Count('pk'))
+            .values('count')
+        ),
+        0,
+    )
+
+
+def fill_counters(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    Recipe = apps.get_model('recipes', 'Recipe')
+    Subscription = apps.get_model('users', 'Subscription')
+    User.objects.update(
+        recipes_count=count(Recipe, 'author'),
+        followers_count=count(Subscription, 'author'),
+        following_count=count(Subscription, 'user'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_alter_user_username'),
+        ('recipes', '0012_favorite_shoppingcartitem'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='followers_count',
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name='Кол-во подписчиков'
+            ),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='following_count',
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name='Кол-во подписок'
+            ),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='recipes_count',
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                verbose_name='Кол-во добавленных рецептов',
+            ),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.4 on 2026-10-17 08:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_counters'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='subscription',
+            constraint=models.CheckConstraint(
+                check=models.Q(('user', models.F('author')), _negated=True),
+                name='user_is_not_author',
+                violation_error_message='Пользователь не может подписаться на самого себя',
+            ),
+        ),
+    ]
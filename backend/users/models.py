@@ -1,9 +1,8 @@
 from django.contrib.auth.models import AbstractUser
-from django.core.exceptions import ValidationError
 from django.core.validators import RegexValidator
 from django.db import models
 
-from users.managers import UserManager, UserRoles
+from users.managers import COUNTER_RELATIONS, UserManager, UserRoles
 
 
 class User(AbstractUser):
@@ -38,6 +37,21 @@ class User(AbstractUser):
         choices=UserRoles.choices,
         default=UserRoles.USER,
     )
+    recipes_count = models.PositiveIntegerField(
+        'Кол-во добавленных рецептов',
+        default=0,
+        editable=False,
+    )
+    followers_count = models.PositiveIntegerField(
+        'Кол-во подписчиков',
+        default=0,
+        editable=False,
+    )
+    following_count = models.PositiveIntegerField(
+        'Кол-во подписок',
+        default=0,
+        editable=False,
+    )
 
     objects = UserManager()
 
@@ -76,18 +90,30 @@ class User(AbstractUser):
                      f'{self.last_name.capitalize()}')
         return full_name.strip()
 
-    def __str__(self):
-        return self.username
+    def save(self, *args, **kwargs):
+        """
+        Save the user without writing back the counter fields
+        unless the user is inserted, as the counters are changed
+        with atomic updates and may be stale in memory.
 
-    def added_recipes_count(self):
-        return self.recipes.count()
+        """
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            deferred_fields = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in COUNTER_RELATIONS
+                and field.attname not in deferred_fields
+            ]
+        super().save(*args, **kwargs)
 
-    added_recipes_count.short_description = 'Кол-во добавленных рецептов'
+    def __str__(self):
+        return self.username
 
 
 class Subscription(models.Model):
     """Model for user subscriptions."""
-    is_cleaned = False
 
     user = models.ForeignKey(
         User,
@@ -109,31 +135,15 @@ class Subscription(models.Model):
             models.UniqueConstraint(
                 fields=('user', 'author'),
                 name='user_author'
-            )
+            ),
+            models.CheckConstraint(
+                check=~models.Q(user=models.F('author')),
+                name='user_is_not_author',
+                violation_error_message=(
+                    'Пользователь не может подписаться на самого себя'
+                ),
+            ),
         ]
 
     def __str__(self):
         return f'{self.user.username} - {self.author.username}'
-
-    def clean(self):
-        """
-        Raise ValidatioError if the user and the author are
-        the same User instance.
-
-        """
-        self.is_cleaned = True
-        if self.user == self.author:
-            raise ValidationError(
-                'Пользователь не может подписаться на самого себя'
-            )
-        super(Subscription, self).clean()
-
-    def save(self, *args, **kwargs):
-        """
-        Does not save a Subscription instance if the user and
-        the recipe author are the same User instance.
-
-        """
-        if not self.is_cleaned:
-            self.full_clean()
-        super(Subscription, self).save(*args, **kwargs)
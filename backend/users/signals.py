@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from users.models import Subscription, User
+
+
+@receiver(post_save, sender=Subscription)
+def count_subscription(sender, instance, created, **kwargs):
+    if created:
+        User.objects.change_counter([instance.author_id], 'followers_count', 1)
+        User.objects.change_counter([instance.user_id], 'following_count', 1)
+
+
+@receiver(post_delete, sender=Subscription)
+def uncount_subscription(sender, instance, **kwargs):
+    User.objects.change_counter([instance.author_id], 'followers_count', -1)
+    User.objects.change_counter([instance.user_id], 'following_count', -1)